@@ -1,3 +1,9 @@
+import sys
+
+from engine.bitboard import Bitboard, iter_bits
+from engine.symmetry import unique_moves
+
+
 def print_board(board):
     """
     Essa função printa no terminal o jogo em questão (3x3, 4x4, 5x5)
@@ -46,12 +52,78 @@ def get_empty_cells(board):
                 empty_cells.append((row, col))
     return empty_cells
 
-def generate_tree(board, current_player, alpha=-float('inf'), beta=float('inf'), depth=0, max_depth=6):
+def search_score(board, current_player, alpha=-float('inf'), beta=float('inf'), depth=0, max_depth=6):
+    """
+    Versão enxuta do generate_tree: faz a mesma busca (minimax com poda alpha-beta e as mesmas pontuações),
+    mas retorna só a pontuação, sem guardar nenhum nó da árvore na memória.
+    Trabalha sobre um Bitboard, fazendo e desfazendo as jogadas no próprio tabuleiro.
+    """
+    if board.x_lines:
+        return -1
+    elif board.o_lines:
+        return 1
+    elif board.is_full() or depth >= max_depth:
+        return 0
+
+    if current_player == "X":
+        score = float('inf')
+        for index in iter_bits(board.empty_mask()):
+            board.play(index, "X")
+            score = min(score, search_score(board, "O", alpha, beta, depth + 1, max_depth))
+            board.undo(index, "X")
+            beta = min(beta, score)
+            # -1 é a menor pontuação possível, nenhuma outra jogada pode ser melhor
+            if beta <= alpha or score == -1:
+                break
+    else:
+        score = -float('inf')
+        for index in iter_bits(board.empty_mask()):
+            board.play(index, "O")
+            score = max(score, search_score(board, "X", alpha, beta, depth + 1, max_depth))
+            board.undo(index, "O")
+            alpha = max(alpha, score)
+            if beta <= alpha or score == 1:
+                break
+    return score
+
+
+def find_best_move(board, current_player, max_depth=6):
+    """
+    Modo enxuto usado pelo jogo: retorna ((row, col), pontuação) da melhor jogada do jogador atual,
+    sem montar a árvore. Jogadas simétricas na raiz são calculadas uma vez só.
+    """
+    size = len(board)
+    bitboard = Bitboard.from_rows(board)
+    next_player = "O" if current_player == "X" else "X"
+    alpha, beta = -float('inf'), float('inf')
+    best_index, best_score = None, None
+    for index, _ in unique_moves(bitboard):
+        bitboard.play(index, current_player)
+        score = search_score(bitboard, next_player, alpha, beta, 1, max_depth)
+        bitboard.undo(index, current_player)
+        if current_player == "X":
+            if best_score is None or score < best_score:
+                best_index, best_score = index, score
+            beta = min(beta, score)
+        else:
+            if best_score is None or score > best_score:
+                best_index, best_score = index, score
+            alpha = max(alpha, score)
+        if beta <= alpha:
+            break
+    return divmod(best_index, size), best_score
+
+
+def generate_tree(board, current_player, alpha=-float('inf'), beta=float('inf'), depth=0, max_depth=6,
+                  explain_depth=None, top_k=None):
     """
     Aqui, essa função gera uma "árvore" de possibilidades que o computador pode jogar, usando o algoritmo do minimax
     junto ao "poda" alpha beta (alpha-beta prunning).
     retorna um dict representando essa árvore com a melhor jogada e sua pontuação
 
+    Modo de explicação (para depuração): com explain_depth, só os primeiros explain_depth níveis viram nós da
+    árvore e abaixo deles só a pontuação é calculada (com search_score); com top_k, cada nó guarda apenas as
+    top_k melhores jogadas. Assim a árvore devolvida fica pequena mesmo com max_depth grande.
     """
     # Checa como o o jogo terminaria
     if check_win(board, "X"):
@@ -67,20 +139,33 @@ def generate_tree(board, current_player, alpha=-float('inf'), beta=float('inf'),
         # Configuração de nível de profundidade da árvore, para evitar crash 
         # se a profundidade max for alcançada retorna uma pontuação estimada do momento
         return {"score": 0}
+    elif explain_depth is not None and depth >= explain_depth:
+        # Abaixo da profundidade de explicação, calcula só a pontuação
+        return {"score": search_score(Bitboard.from_rows(board), current_player, alpha, beta, depth, max_depth)}
 
     # Inicializando a Arvore
     tree = {"score": None, "moves": []}
     
+    # Na raiz, as jogadas simétricas (rotações e reflexões) são agrupadas e só um representante é calculado
+    if depth == 0:
+        size = len(board)
+        move_groups = [(divmod(index, size), [divmod(other, size) for other in orbit])
+                       for index, orbit in unique_moves(Bitboard.from_rows(board))]
+    else:
+        move_groups = [((row, col), [(row, col)]) for row, col in get_empty_cells(board)]
+
     #  Calcular sobre todos os movimentos possíveis
-    for row, col in get_empty_cells(board):
+    for (row, col), equivalents in move_groups:
         # Fazer a jogada no tabuleiro
         board[row][col] = current_player
         # Geração das sub-arvores de cada jogada
-        subtree = generate_tree(board, "O" if current_player == "X" else "X", alpha, beta, depth + 1, max_depth)
+        subtree = generate_tree(board, "O" if current_player == "X" else "X", alpha, beta, depth + 1, max_depth,
+                                explain_depth, top_k)
         # Refazendo a movimentação do tabuleiro
         board[row][col] = " "
-        # Adiciona a jogada e sua sub-arvore para a árvore do jogo
-        tree["moves"].append({"row": row, "col": col, "subtree": subtree})
+        # Adiciona a jogada (e as jogadas equivalentes a ela) e sua sub-arvore para a árvore do jogo
+        for eq_row, eq_col in equivalents:
+            tree["moves"].append({"row": eq_row, "col": eq_col, "subtree": subtree})
 
         # Atualiza os valores do alpha e do beta para o alpha-beta pruning (cortar jogadas futeis)
         if current_player == "X":
@@ -98,15 +183,26 @@ def generate_tree(board, current_player, alpha=-float('inf'), beta=float('inf'),
     else:
         tree["score"] = max(move["subtree"]["score"] for move in tree["moves"])
 
+    # No modo de explicação, mantém só as top_k melhores jogadas do nó
+    if top_k is not None:
+        tree["moves"].sort(key=lambda move: move["subtree"]["score"], reverse=current_player == "O")
+        del tree["moves"][top_k:]
+
     return tree
 
 
+def print_explanation(tree, indent=0):
+    """Mostra no terminal a árvore (pequena) gerada no modo de explicação."""
+    for move in tree.get("moves", []):
+        print("  " * indent + "({}, {}) -> {}".format(move["row"], move["col"], move["subtree"]["score"]))
+        print_explanation(move["subtree"], indent + 1)
+
+
 def play_game():
     """
     Essa parte da função iniciliza um novo jogo, e manipula o input do usuário
     """
-    
-while True:
+    while True:
         while True:
             size = input("Enter the size of the board (3, 4 or 5): ") # tamanho do tabuleiro
             if size.isdigit() and int(size) in [3, 4, 5]: #limitação do tamanho do tabuleiro
@@ -136,9 +232,11 @@ while True:
                         print("Invalid move. Please enter a valid move (1-{}).".format(size * size))
                 board[row][col] = current_player
             else:
-                tree = generate_tree(board, current_player) # quando o jogador faz uma jogada legal, chamando a função de calculo das possibilidades
-                best_move = max(tree["moves"], key=lambda move: move["subtree"]["score"])
-                row, col = best_move["row"], best_move["col"]
+                # quando o jogador faz uma jogada legal, calcula a melhor resposta só com as pontuações (sem árvore)
+                (row, col), _ = find_best_move(board, current_player)
+                if "--explain" in sys.argv:
+                    # modo de depuração: mostra as 3 melhores jogadas com 2 níveis de explicação
+                    print_explanation(generate_tree(board, current_player, explain_depth=2, top_k=3))
                 board[row][col] = current_player
 
             if check_win(board, current_player): #função para declarar vitória
@@ -166,7 +264,8 @@ while True:
         if play_again.lower() != "y":
             break
 
-play_game()
+if __name__ == "__main__":
+    play_game()
 '''
 Esta função usa o algoritmo minimax com a "poda" alfa-beta (prunning) para gerar uma árvore de jogo representando todos os movimentos possíveis e seus resultados.
 A função recebe como entrada o estado atual do tabuleiro, o jogador atual (seja “X” ou “O”) e parâmetros opcionais para remoção alfa-beta (alfa e beta), 
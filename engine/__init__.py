@@ -0,0 +1,50 @@
+"""
+Motor de busca do jogo da velha, sem interface gráfica.
+
+Importar o pacote não carrega nenhum submódulo: os nomes abaixo são
+resolvidos na primeira vez em que são usados, então ``import engine`` é
+barato tanto para os jogos quanto para os processos workers.
+"""
+
+# Nome público -> submódulo onde ele está definido
+_EXPORTS = {
+    "Bitboard": "engine.bitboard",
+    "TranspositionTable": "engine.transposition",
+    "MoveOrderer": "engine.ordering",
+    "unique_moves": "engine.symmetry",
+    "SearchTimeout": "engine.search",
+    "SearchCancelled": "engine.search",
+    "minimax": "engine.search",
+    "check_win_state": "engine.search",
+    "evaluate_position": "engine.search",
+    "evaluate_positions": "engine.vectorized",
+    "search_root": "engine.search",
+    "iterative_deepening": "engine.search",
+    "choose_move": "engine.search",
+    "analyze_batch": "engine.batch",
+    "computer_move": "engine.search",
+    "mcts_move": "engine.mcts",
+    "solve": "engine.solver",
+    "Tablebase": "engine.tablebase",
+    "EnginePool": "engine.pool",
+    "Ponderer": "engine.ponder",
+    "SearchStats": "engine.stats",
+    "EngineServer": "engine.server",
+    "EngineClient": "engine.server",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'engine' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
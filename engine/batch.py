@@ -0,0 +1,316 @@
+"""
+Análise de posições em lote.
+
+``analyze_batch`` recebe um iterável de posições e devolve, em ordem e sob
+demanda, um dicionário por posição com a melhor jogada, o score, os nós
+visitados e o tempo gasto. O trabalho é dividido em blocos entre processos
+de um pool criado uma vez para o lote inteiro, e só alguns blocos ficam em
+andamento ao mesmo tempo, então a memória não cresce com o tamanho da entrada.
+
+Formatos de entrada aceitos pela linha de comando (``python -m engine.batch``):
+
+- texto: uma posição por linha, com as n*n casas ("X", "O" e ".", "-" ou "_" para
+  vazias; "/" entre as linhas é opcional) e, opcionalmente, o jogador da vez
+  depois de um espaço. Sem ele, X joga quando as duas contagens são iguais.
+  Linhas vazias e começadas por "#" são ignoradas;
+- binário: registros de RECORD_SIZE bytes (tamanho, jogador da vez 0=X/1=O,
+  máscara de X e máscara de O, little-endian). As máscaras têm 32 bits, então o
+  formato só aceita tabuleiros até MAX_BINARY_SIZE x MAX_BINARY_SIZE.
+
+A saída é JSON Lines, uma linha por posição, com o score do ponto de vista do
+jogador da vez. Com ``--static``, não há busca: cada bloco é pontuado de uma vez
+pela heurística (engine.vectorized, com NumPy quando instalado).
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import struct
+import sys
+import time
+
+from engine.bitboard import O, X, Bitboard
+from engine.mcts import mcts_move
+from engine.ordering import MoveOrderer
+from engine.search import choose_move
+from engine.stats import SearchStats
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
+from engine.vectorized import evaluate_positions
+
+RECORD = struct.Struct("<BBII")
+RECORD_SIZE = RECORD.size
+# Maior tabuleiro cujas máscaras cabem nos 32 bits do registro binário
+MAX_BINARY_SIZE = 5
+
+DEFAULT_CHUNK_SIZE = 64
+
+_EMPTY_CHARS = ".-_ "
+
+# Estado de cada processo do lote (criado em _init_batch_worker)
+_batch_tt = None
+_batch_orderer = None
+
+
+def parse_position(text):
+    """Converte uma linha do formato texto em (size, x, o, side)."""
+    fields = text.split()
+    cells = fields[0].replace("/", "") if fields else ""
+    size = int(round(len(cells) ** 0.5))
+    if size < 3 or size * size != len(cells):
+        raise ValueError(f"invalid position {text!r}: expected n*n cells")
+    x = o = 0
+    for index, cell in enumerate(cells.upper()):
+        if cell == X:
+            x |= 1 << index
+        elif cell == O:
+            o |= 1 << index
+        elif cell not in _EMPTY_CHARS:
+            raise ValueError(f"invalid cell {cell!r} in {text!r}")
+    if len(fields) > 1:
+        side = fields[1].upper()
+        if side not in (X, O):
+            raise ValueError(f"invalid side to move {fields[1]!r}")
+    else:
+        side = X if x.bit_count() == o.bit_count() else O
+    return size, x, o, side
+
+
+def format_position(size, x, o):
+    """Converte as máscaras de volta para o formato texto (sem o jogador da vez)."""
+    return "".join(X if x >> index & 1 else O if o >> index & 1 else "."
+                   for index in range(size * size))
+
+
+def read_text_positions(stream):
+    """
+    Lê as linhas de posição de um arquivo em modo texto. As linhas são devolvidas
+    sem conversão: cada uma é interpretada no worker, e uma linha inválida vira
+    um resultado com "error" em vez de interromper o lote.
+    """
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def read_binary_positions(stream):
+    """Lê posições no formato binário de um arquivo aberto em modo binário."""
+    while True:
+        record = stream.read(RECORD_SIZE)
+        if not record:
+            return
+        if len(record) < RECORD_SIZE:
+            raise ValueError("truncated binary record")
+        size, side, x, o = RECORD.unpack(record)
+        if size > MAX_BINARY_SIZE:
+            raise ValueError(f"binary records support boards up to {MAX_BINARY_SIZE}x{MAX_BINARY_SIZE}, got {size}")
+        yield size, x, o, O if side else X
+
+
+def check_position(size, x, o, k=None):
+    """Lança ValueError se as máscaras não formarem uma posição válida."""
+    if size < 3 or x & o or (x | o) >> (size * size) or (k is not None and not 3 <= k <= size):
+        raise ValueError(f"invalid position: size={size} x={x:#x} o={o:#x} k={k}")
+
+
+def position_board(size, x, o, side, k=None):
+    """
+    Cria o Bitboard de uma posição com o jogador da vez no papel do computador (O),
+    trocando as cores quando X joga. ``k`` é o número de peças em linha para vencer.
+    """
+    check_position(size, x, o, k)
+    return Bitboard(size, o, x, k) if side == X else Bitboard(size, x, o, k)
+
+
+def analyze_position(position, depth=None, time_budget_ms=None, tt=None, orderer=None, full_stats=False,
+                     algorithm="minimax", playouts=None, k=None):
+    """
+    Analisa uma posição (size, x, o, side) e retorna o dicionário de resultado.
+    Com ``full_stats``, o resultado traz todas as estatísticas da busca em "stats".
+    Com ``algorithm`` "mcts", a jogada vem de engine.mcts (``playouts`` simulações
+    ou ``time_budget_ms``), o score é a recompensa média de -1 a 1 e "nodes" conta
+    as simulações. ``k`` é o número de peças em linha para vencer (padrão: o tamanho).
+    """
+    size, x, o, side = position
+    board = position_board(size, x, o, side, k)
+    started = time.perf_counter()
+    result = {"position": format_position(size, x, o), "side": side}
+    if board.x_lines or board.o_lines or board.is_full():
+        # Posição terminal: não há jogada a procurar
+        win = 1 if algorithm == "mcts" else 1000
+        score = win if board.o_lines else -win if board.x_lines else 0
+        result.update(best_move=None, score=score, nodes=0)
+    else:
+        stats = SearchStats()
+        if algorithm == "mcts":
+            best = mcts_move(board, time_budget_ms, playouts, stats=stats)
+        else:
+            best = choose_move(board, depth, 1, tt, time_budget_ms=time_budget_ms, orderer=orderer, stats=stats)
+        result.update(best_move=list(board.coords(best[0])), score=best[1], nodes=stats.nodes)
+        if full_stats:
+            result["stats"] = stats.to_dict()
+    result["time_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def _init_batch_worker(tt_bytes):
+    """Cria a tabela de transposição e o ordenador do processo, reaproveitados entre as posições."""
+    global _batch_tt, _batch_orderer
+    _batch_tt = TranspositionTable(tt_bytes)
+    _batch_orderer = MoveOrderer()
+
+
+def evaluate_chunk(chunk, k=None):
+    """
+    Avalia estaticamente um bloco de (id, posição), sem busca: as posições de
+    cada tamanho são pontuadas juntas por engine.vectorized.evaluate_positions.
+    Retorna os resultados na ordem do bloco, com o score do ponto de vista do jogador da vez.
+    ``k`` é o número de peças em linha para vencer (padrão: o tamanho).
+    """
+    results = []
+    by_size = collections.defaultdict(list)
+    for position_id, position in chunk:
+        result = {"id": position_id}
+        try:
+            if isinstance(position, str):
+                position = parse_position(position)
+            size, x, o, side = position
+            check_position(size, x, o, k)
+            result.update(position=format_position(size, x, o), side=side)
+            by_size[size].append((result, x, o))
+        except ValueError as e:
+            result["error"] = str(e)
+        results.append(result)
+    for size, entries in by_size.items():
+        scores = evaluate_positions(size, [(x, o) for _, x, o in entries], k)
+        for (result, _, _), score in zip(entries, scores):
+            result["score"] = score if result["side"] == O else -score
+    return results
+
+
+def _analyze_chunk(args):
+    """Analisa um bloco de (id, posição) em um processo do pool."""
+    chunk, depth, time_budget_ms, full_stats, algorithm, playouts, static, k = args
+    if static:
+        return evaluate_chunk(chunk, k)
+    results = []
+    for position_id, position in chunk:
+        results.append(_analyze_one(position_id, position, depth, time_budget_ms, full_stats, algorithm, playouts,
+                                    k))
+    return results
+
+
+def _analyze_one(position_id, position, depth, time_budget_ms, full_stats, algorithm, playouts, k=None):
+    result = {"id": position_id}
+    try:
+        if isinstance(position, str):
+            position = parse_position(position)
+        result.update(analyze_position(position, depth, time_budget_ms, _batch_tt, _batch_orderer, full_stats,
+                                       algorithm, playouts, k))
+    except ValueError as e:
+        result["error"] = str(e)
+    return result
+
+
+def analyze_batch(positions, depth=None, time_budget_ms=None, num_workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                  tt_bytes=DEFAULT_TT_BYTES, full_stats=False, algorithm="minimax", playouts=None, static=False,
+                  k=None):
+    """
+    Analisa um iterável de posições (size, x, o, side) ou linhas no formato texto,
+    com profundidade fixa ``depth`` ou com ``time_budget_ms`` por posição, gerando
+    um resultado por posição na ordem da entrada. Com mais de um worker, os blocos de ``chunk_size`` posições vão para
+    um pool de processos; no máximo 2 blocos por worker ficam em andamento.
+    Com ``full_stats``, cada resultado traz as estatísticas completas da busca.
+    ``algorithm`` e ``playouts`` são os de analyze_position; com "mcts", ``playouts``
+    pode substituir ``depth``. Com ``static``, não há busca: cada bloco é avaliado
+    de uma vez por evaluate_chunk e o resultado traz apenas o score heurístico.
+    ``k`` é o número de peças em linha para vencer em todas as posições (padrão: o tamanho).
+    """
+    searched = depth is not None or time_budget_ms is not None or (algorithm == "mcts" and playouts is not None)
+    if not (searched or static):
+        raise ValueError("either depth or time_budget_ms must be given")
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    # Os argumentos são validados na chamada; só a análise fica para o gerador
+    return _analyze_positions(positions, depth, time_budget_ms, num_workers, chunk_size, tt_bytes, full_stats,
+                              algorithm, playouts, static, k)
+
+
+def _analyze_positions(positions, depth, time_budget_ms, num_workers, chunk_size, tt_bytes, full_stats, algorithm,
+                       playouts, static, k):
+    """Gerador dos resultados de analyze_batch, com os argumentos já validados."""
+    numbered = enumerate(positions)
+
+    if num_workers <= 1 and static:
+        while True:
+            chunk = list(itertools.islice(numbered, chunk_size))
+            if not chunk:
+                return
+            yield from evaluate_chunk(chunk, k)
+
+    if num_workers <= 1:
+        _init_batch_worker(tt_bytes)
+        for position_id, position in numbered:
+            yield _analyze_one(position_id, position, depth, time_budget_ms, full_stats, algorithm, playouts, k)
+        return
+
+    with multiprocessing.Pool(num_workers, initializer=_init_batch_worker, initargs=(tt_bytes,)) as pool:
+        pending = collections.deque()
+        while True:
+            while len(pending) < 2 * num_workers:
+                chunk = list(itertools.islice(numbered, chunk_size))
+                if not chunk:
+                    break
+                task = (chunk, depth, time_budget_ms, full_stats, algorithm, playouts, static, k)
+                pending.append(pool.apply_async(_analyze_chunk, (task,)))
+            if not pending:
+                break
+            yield from pending.popleft().get()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze tic-tac-toe positions and print JSON Lines results.")
+    parser.add_argument("input", nargs="?", default="-", help="input file ('-' for stdin)")
+    parser.add_argument("--format", choices=("text", "binary"), default="text")
+    budget = parser.add_mutually_exclusive_group(required=True)
+    budget.add_argument("--depth", type=int, help="fixed search depth")
+    budget.add_argument("--time-ms", type=int, help="time budget per position (iterative deepening)")
+    budget.add_argument("--playouts", type=int, help="playouts per position (--algorithm mcts only)")
+    budget.add_argument("--static", action="store_true",
+                        help="heuristic score only, no search (vectorized with NumPy when installed)")
+    parser.add_argument("--k", type=int, help="pieces in a row needed to win (default: the board size)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--tt-mb", type=int, default=DEFAULT_TT_BYTES // (1024 * 1024),
+                        help="transposition table size per worker, in MB")
+    parser.add_argument("--stats", action="store_true", help="include full search statistics in each result")
+    parser.add_argument("--algorithm", choices=("minimax", "mcts"), default="minimax")
+    args = parser.parse_args(argv)
+    if args.playouts is not None and args.algorithm != "mcts":
+        parser.error("--playouts requires --algorithm mcts")
+
+    binary = args.format == "binary"
+    if args.input == "-":
+        stream = sys.stdin.buffer if binary else sys.stdin
+    else:
+        stream = open(args.input, "rb" if binary else "r")
+    try:
+        positions = read_binary_positions(stream) if binary else read_text_positions(stream)
+        results = analyze_batch(positions, args.depth, args.time_ms, args.workers, args.chunk_size,
+                                args.tt_mb * 1024 * 1024, args.stats, args.algorithm, args.playouts, args.static,
+                                args.k)
+        for result in results:
+            sys.stdout.write(json.dumps(result) + "\n")
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if stream not in (sys.stdin, sys.stdin.buffer):
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
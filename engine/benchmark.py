@@ -0,0 +1,229 @@
+"""
+Benchmark reproduzível do motor de busca.
+
+Uso: ``python -m engine.benchmark [--sizes 3,4,5] [--workers 1,2,4] [--strategies alphabeta,pvs,mtdf]
+[--output run.json]``.
+
+Cada posição do CORPUS (aberturas, meio-jogos e finais de 3x3, 4x4 e 5x5) é
+buscada em cada profundidade de DEPTHS, com cada estratégia de janela pedida
+(engine.search.STRATEGIES), em série (1 worker) e com um EnginePool para cada
+número de workers pedido. Cada medida começa com as tabelas vazias,
+é precedida de rodadas de aquecimento e repetida ``--repeat`` vezes; o tempo
+informado é a mediana. O resultado é salvo em JSON e pode ser comparado com
+uma execução anterior com ``--compare anterior.json``. No fim, os nós e o tempo
+somados de cada estratégia são comparados com os do alfa-beta.
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+
+from engine.batch import parse_position, position_board
+from engine.ordering import MoveOrderer
+from engine.search import STRATEGIES, choose_move
+from engine.stats import SearchStats
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
+
+# Posições fixas por tamanho e fase (formato texto de engine.batch; X joga
+# quando as contagens são iguais). Foram sorteadas uma vez e não devem mudar,
+# senão as execuções antigas deixam de ser comparáveis.
+CORPUS = {
+    3: {
+        "opening": [".......X.", "..X......"],
+        "midgame": ["...OXX.O.", "...OXXO.."],
+        "endgame": [".O.XOO.XX", "OX.OXO..X"],
+    },
+    4: {
+        "opening": ["....X...O.......", "......X......O.."],
+        "midgame": ["O....OO...X.XX..", ".OX..O.....X.OX."],
+        "endgame": [".X.XOOX..OX.XOXO", "O..OOXO.X..XXXXO"],
+    },
+    5: {
+        "opening": [".............O........X..", "...O...............X....."],
+        "midgame": ["....O..O..XX..O....XOX...", "....O.X.X..OO..X...OX...."],
+        "endgame": ["X.XOOXOX..O..XOOO..XXOXX.", ".OOXX.XXXOX..OOOX..O.XO.X"],
+    },
+}
+
+# Profundidades medidas em cada tamanho
+DEPTHS = {3: (9,), 4: (4, 6, 8), 5: (4, 5, 6)}
+
+BENCHMARK_VERSION = 1
+
+
+def measure(board, depth, num_workers, pool, tt_bytes, strategy="alphabeta", solver_nodes=0):
+    """Faz uma busca com tabelas vazias e retorna (tempo em s, (índice, score), SearchStats)."""
+    tt = TranspositionTable(tt_bytes)
+    stats = SearchStats()
+    if pool is not None:
+        pool.clear_tables()
+    started = time.perf_counter()
+    best = choose_move(board.copy(), depth, num_workers, tt, tt_bytes, pool=pool, orderer=MoveOrderer(),
+                       stats=stats, strategy=strategy, solver_nodes=solver_nodes, use_tablebase=False)
+    return time.perf_counter() - started, best, stats
+
+
+def run(sizes, worker_counts, repeat=3, warmup=1, tt_bytes=DEFAULT_TT_BYTES, log=None, strategies=("alphabeta",),
+        solver_nodes=0):
+    """
+    Executa o benchmark e retorna o dicionário de resultados (ver main). Por padrão
+    o solucionador exato fica desligado, para medir só a busca; ``solver_nodes``
+    o liga com esse limite de nós. A tablebase do 4x4 nunca é usada.
+    """
+    results = []
+    for num_workers, strategy in itertools.product(worker_counts, strategies):
+        if strategy == "mtdf" and num_workers > 1:
+            continue  # o MTD(f) é sempre serial
+        pool = None
+        if num_workers > 1:
+            from engine.pool import EnginePool
+            pool = EnginePool(num_workers, tt_bytes)
+        try:
+            for size in sizes:
+                for phase, positions in CORPUS[size].items():
+                    for text in positions:
+                        board = position_board(*parse_position(text))
+                        for depth in DEPTHS[size]:
+                            for _ in range(warmup):
+                                measure(board, depth, num_workers, pool, tt_bytes, strategy, solver_nodes)
+                            timings = []
+                            for _ in range(repeat):
+                                seconds, best, stats = measure(board, depth, num_workers, pool, tt_bytes, strategy,
+                                                               solver_nodes)
+                                timings.append(seconds)
+                            seconds = statistics.median(timings)
+                            result = {"size": size, "phase": phase, "position": text, "depth": depth,
+                                      "workers": num_workers, "strategy": strategy,
+                                      "move": list(board.coords(best[0])),
+                                      "score": best[1], "nodes": stats.nodes,
+                                      "time_ms": round(seconds * 1000, 3),
+                                      "times_ms": [round(t * 1000, 3) for t in timings],
+                                      "nps": round(stats.nodes / seconds) if seconds else 0}
+                            results.append(result)
+                            if log is not None:
+                                log(f"{size}x{size} {phase:8} {text} d={depth} w={num_workers} {strategy}: "
+                                    f"{result['time_ms']:.1f} ms, {result['nps']} nodes/s")
+        finally:
+            if pool is not None:
+                pool.close()
+
+    # Aceleração de cada configuração paralela em relação à serial da mesma medida
+    serial = {(r["position"], r["depth"], r["strategy"]): r["time_ms"] for r in results if r["workers"] == 1}
+    for result in results:
+        base = serial.get((result["position"], result["depth"], result["strategy"]))
+        result["speedup"] = round(base / result["time_ms"], 3) if base and result["time_ms"] else None
+
+    return {"version": BENCHMARK_VERSION, "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(), "repeat": repeat, "warmup": warmup,
+            "tt_bytes": tt_bytes, "solver_nodes": solver_nodes, "results": results}
+
+
+def strategy_totals(results):
+    """
+    Soma os nós e o tempo de cada (tamanho, workers, estratégia) e retorna as linhas
+    do relatório, com a razão em relação ao alfa-beta da mesma combinação.
+    """
+    totals = collections.defaultdict(lambda: [0, 0.0])
+    for result in results:
+        entry = totals[(result["size"], result["workers"], result.get("strategy", "alphabeta"))]
+        entry[0] += result["nodes"]
+        entry[1] += result["time_ms"]
+    lines = []
+    for (size, workers, strategy), (nodes, time_ms) in sorted(totals.items()):
+        base = totals.get((size, workers, "alphabeta"))
+        ratio = f" (nodes x{nodes / base[0]:.2f}, time x{time_ms / base[1]:.2f} vs alphabeta)" \
+            if base and strategy != "alphabeta" and base[0] and base[1] else ""
+        lines.append(f"{size}x{size} w={workers} {strategy}: {nodes} nodes, {time_ms:.1f} ms{ratio}")
+    return lines
+
+
+def compare(baseline, current, tolerance, min_ms=5.0):
+    """
+    Compara duas execuções medida a medida. Retorna a lista de linhas do relatório
+    e o número de regressões (medidas mais lentas que ``tolerance``, em fração, ou
+    com outra jogada ou score). Medidas abaixo de ``min_ms`` nas duas execuções são
+    curtas demais para o tempo ser confiável e só contam se o resultado mudar.
+    """
+    previous = {(r["position"], r["depth"], r["workers"], r.get("strategy", "alphabeta")): r
+                for r in baseline["results"]}
+    lines = []
+    regressions = 0
+    for result in current["results"]:
+        old = previous.get((result["position"], result["depth"], result["workers"], result["strategy"]))
+        if old is None:
+            continue
+        ratio = result["time_ms"] / old["time_ms"] if old["time_ms"] else 1.0
+        notes = []
+        if ratio > 1 + tolerance and max(result["time_ms"], old["time_ms"]) >= min_ms:
+            notes.append("SLOWER")
+        if (result["move"], result["score"]) != (old["move"], old["score"]):
+            notes.append(f"RESULT CHANGED (was {old['move']} {old['score']})")
+        regressions += bool(notes)
+        lines.append(f"{result['size']}x{result['size']} {result['position']} d={result['depth']} "
+                     f"w={result['workers']} {result['strategy']}: {old['time_ms']:.1f} -> {result['time_ms']:.1f} ms "
+                     f"(x{ratio:.2f}), nodes {old['nodes']} -> {result['nodes']} {' '.join(notes)}".rstrip())
+    return lines, regressions
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+def _strategy_list(text):
+    strategies = text.split(",")
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise argparse.ArgumentTypeError(f"unknown strategy {strategy!r} (choose from {', '.join(STRATEGIES)})")
+    return strategies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search engine on a fixed set of positions.")
+    parser.add_argument("--sizes", type=_int_list, default=sorted(CORPUS), help="board sizes, e.g. 3,4")
+    parser.add_argument("--workers", type=_int_list,
+                        default=[1] + [n for n in (2, 4, 8) if n <= multiprocessing.cpu_count()],
+                        help="worker counts, e.g. 1,2,4 (1 is the serial baseline)")
+    parser.add_argument("--strategies", type=_strategy_list, default=["alphabeta"],
+                        help="search window strategies, e.g. alphabeta,pvs,mtdf (mtdf is serial only)")
+    parser.add_argument("--solver-nodes", type=int, default=0,
+                        help="run the exact solver first with this node limit (default 0: search only)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed trials per measurement")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before each measurement")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON file from a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="slowdown fraction reported as a regression (default 0.10)")
+    parser.add_argument("--min-ms", type=float, default=5.0,
+                        help="ignore slowdowns in measurements shorter than this (default 5 ms)")
+    args = parser.parse_args(argv)
+    if any(size not in CORPUS for size in args.sizes):
+        parser.error(f"sizes must be in {sorted(CORPUS)}")
+    if 1 not in args.workers:
+        args.workers.insert(0, 1)  # a linha de base serial é necessária para a aceleração
+
+    current = run(args.sizes, args.workers, args.repeat, args.warmup, log=print, strategies=args.strategies,
+                  solver_nodes=args.solver_nodes)
+    if len(args.strategies) > 1:
+        print("\n".join(strategy_totals(current["results"])))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, current, args.tolerance, args.min_ms)
+        print("\n".join(lines))
+        print(f"{regressions} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Representação compacta do tabuleiro do jogo da velha usando bitboards.
+
+Cada jogador é guardado como um único inteiro, onde o bit ``row * size + col``
+indica que existe uma peça daquele jogador na casa (row, col). As regras são as
+de um jogo m,n,k quadrado: vence quem alinha ``k`` peças em um tabuleiro
+``size`` x ``size``. No jogo da velha clássico k é o próprio tamanho (linhas,
+colunas e as duas diagonais completas); com k menor, como no 7x7 com 4 em linha
+ou no gomoku 15x15 com 5, as linhas vencedoras são todas as janelas de k casas
+nas quatro direções. As janelas são pré-calculadas como máscaras para cada
+(tamanho, k), então o teste de vitória vira algumas operações AND/comparação e
+a geração de jogadas vira iteração sobre bits.
+
+O tabuleiro também mantém um hash de Zobrist atualizado incrementalmente a cada
+jogada, usado como chave da tabela de transposição, e a contagem de peças de X
+e de O em cada janela. Com as contagens, a vitória é detectada quando a última
+jogada completa uma janela, as ameaças (janelas a uma peça da vitória) ficam
+sempre à mão e a avaliação heurística é mantida como soma corrente, sem varrer
+o tabuleiro a cada nó da busca.
+"""
+
+import random
+
+EMPTY = " "
+X = "X"
+O = "O"
+
+# Distância (em casas, incluindo diagonais) das peças existentes dentro da qual
+# as jogadas são geradas quando k é menor que o tamanho do tabuleiro
+NEIGHBOURHOOD_RADIUS = 2
+
+# Cache das máscaras de linhas vencedoras por (tamanho, k)
+_LINE_MASKS = {}
+
+
+def line_masks(size, k=None):
+    """
+    Retorna a tupla com as máscaras das linhas vencedoras do tabuleiro.
+    Com k igual ao tamanho (padrão), são as 2n+2 linhas, colunas e diagonais;
+    com k menor, todas as janelas de k casas em linhas, colunas e diagonais.
+    """
+    k = size if k is None else k
+    lines = _LINE_MASKS.get((size, k))
+    if lines is None:
+        masks = []
+        span = range(size - k + 1)
+        # Linhas
+        for row in range(size):
+            for start in span:
+                masks.append(sum(1 << (row * size + start + i) for i in range(k)))
+        # Colunas
+        for col in range(size):
+            for start in span:
+                masks.append(sum(1 << ((start + i) * size + col) for i in range(k)))
+        # Diagonais principais e diagonais secundárias
+        for row in span:
+            for col in span:
+                masks.append(sum(1 << ((row + i) * size + col + i) for i in range(k)))
+        for row in span:
+            for col in span:
+                masks.append(sum(1 << ((row + i) * size + col + k - i - 1) for i in range(k)))
+        lines = _LINE_MASKS[(size, k)] = tuple(masks)
+    return lines
+
+
+# Cache dos índices das linhas que passam por cada casa, por (tamanho, k)
+_CELL_LINES = {}
+
+
+def cell_lines(size, k=None):
+    """Retorna, para cada casa, a tupla com os índices (em line_masks) das linhas que passam por ela."""
+    k = size if k is None else k
+    lines = _CELL_LINES.get((size, k))
+    if lines is None:
+        masks = line_masks(size, k)
+        lines = _CELL_LINES[(size, k)] = tuple(
+            tuple(line for line, mask in enumerate(masks) if mask >> index & 1)
+            for index in range(size * size))
+    return lines
+
+
+def window_weights(size, k=None):
+    """
+    Valor de uma linha com ``c`` peças de um só jogador, para c de 0 a k.
+    No jogo clássico é c²; com k menor que o tamanho, o valor cresce 4 vezes a
+    cada peça, para que ameaças (k-1 peças) pesem mais que muitas linhas fracas.
+    """
+    k = size if k is None else k
+    if k == size:
+        return tuple(c * c for c in range(k + 1))
+    return (0,) + tuple(4 ** (c - 1) for c in range(1, k + 1))
+
+
+def line_score(x_count, o_count, weights=None):
+    """Contribuição de uma linha para a heurística: positiva para O, negativa para X."""
+    if x_count == 0:
+        return weights[o_count] if weights is not None else o_count * o_count
+    if o_count == 0:
+        return -weights[x_count] if weights is not None else -x_count * x_count
+    return 0
+
+
+# Cache das chaves de Zobrist por tamanho de tabuleiro
+_ZOBRIST_KEYS = {}
+
+
+def zobrist_keys(size):
+    """
+    Retorna as chaves de Zobrist do tabuleiro: (chaves de X, chaves de O, chave do lado a jogar).
+    A semente é fixa para que todos os processos gerem as mesmas chaves.
+    """
+    keys = _ZOBRIST_KEYS.get(size)
+    if keys is None:
+        rng = random.Random(size)
+        keys_x = tuple(rng.getrandbits(64) for _ in range(size * size))
+        keys_o = tuple(rng.getrandbits(64) for _ in range(size * size))
+        keys = _ZOBRIST_KEYS[size] = (keys_x, keys_o, rng.getrandbits(64))
+    return keys
+
+
+# Cache das máscaras usadas para deslocar peças sem atravessar a borda, por tamanho
+_EDGE_MASKS = {}
+
+
+def edge_masks(size):
+    """Retorna (todas as casas fora da primeira coluna, todas fora da última coluna)."""
+    masks = _EDGE_MASKS.get(size)
+    if masks is None:
+        full = (1 << (size * size)) - 1
+        first = sum(1 << (row * size) for row in range(size))
+        masks = _EDGE_MASKS[size] = (full & ~first, full & ~(first << (size - 1)))
+    return masks
+
+
+def iter_bits(mask):
+    """Itera sobre os índices dos bits ligados de uma máscara, do menor para o maior."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Bitboard:
+    """
+    Tabuleiro com uma máscara de bits por jogador.
+
+    As jogadas são feitas e desfeitas no próprio objeto (``play``/``undo``),
+    evitando cópias durante a busca. ``x_counts``/``o_counts`` guardam as peças de
+    cada jogador por linha, ``x_lines``/``o_lines`` quantas linhas cada um completou,
+    ``x_threats``/``o_threats`` as linhas a uma peça da vitória (sem peças do
+    adversário) e ``score`` a avaliação heurística da posição (positiva para O).
+    """
+
+    __slots__ = ("size", "k", "x", "o", "full", "lines", "hash", "zx", "zo", "zside", "cell_lines", "weights",
+                 "radius", "x_counts", "o_counts", "x_lines", "o_lines", "x_threats", "o_threats", "score")
+
+    def __init__(self, size, x=0, o=0, k=None):
+        self.size = size
+        self.k = size if k is None else k
+        self.x = x
+        self.o = o
+        self.full = (1 << (size * size)) - 1
+        self.lines = line_masks(size, self.k)
+        self.zx, self.zo, self.zside = zobrist_keys(size)
+        self.hash = 0
+        for index in iter_bits(x):
+            self.hash ^= self.zx[index]
+        for index in iter_bits(o):
+            self.hash ^= self.zo[index]
+        self.cell_lines = cell_lines(size, self.k)
+        self.weights = window_weights(size, self.k)
+        # Jogadas só perto das peças quando as linhas vencedoras não cobrem o tabuleiro todo
+        self.radius = None if self.k == size else NEIGHBOURHOOD_RADIUS
+        self.x_counts = [(x & mask).bit_count() for mask in self.lines]
+        self.o_counts = [(o & mask).bit_count() for mask in self.lines]
+        self.x_lines = self.x_counts.count(self.k)
+        self.o_lines = self.o_counts.count(self.k)
+        threat = self.k - 1
+        self.x_threats = {line for line, (xc, oc) in enumerate(zip(self.x_counts, self.o_counts))
+                          if xc == threat and oc == 0}
+        self.o_threats = {line for line, (xc, oc) in enumerate(zip(self.x_counts, self.o_counts))
+                          if oc == threat and xc == 0}
+        self.score = sum(line_score(xc, oc, self.weights) for xc, oc in zip(self.x_counts, self.o_counts))
+
+    def __reduce__(self):
+        # Serializa apenas o tamanho, as duas máscaras e k
+        return (Bitboard, (self.size, self.x, self.o, self.k))
+
+    def __eq__(self, other):
+        return (isinstance(other, Bitboard) and self.size == other.size and self.k == other.k
+                and self.x == other.x and self.o == other.o)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        k = f", k={self.k}" if self.k != self.size else ""
+        return f"Bitboard(size={self.size}, x={self.x:#x}, o={self.o:#x}{k})"
+
+    @classmethod
+    def from_rows(cls, rows, k=None):
+        """Converte um tabuleiro em lista de listas (" ", "X", "O") para bitboard."""
+        size = len(rows)
+        x = o = 0
+        for row in range(size):
+            for col in range(size):
+                cell = rows[row][col]
+                if cell == X:
+                    x |= 1 << (row * size + col)
+                elif cell == O:
+                    o |= 1 << (row * size + col)
+        return cls(size, x, o, k)
+
+    def to_rows(self):
+        """Converte o bitboard de volta para lista de listas."""
+        size = self.size
+        return [[self.get(row, col) for col in range(size)] for row in range(size)]
+
+    def copy(self):
+        return Bitboard(self.size, self.x, self.o, self.k)
+
+    def index(self, row, col):
+        return row * self.size + col
+
+    def coords(self, index):
+        return divmod(index, self.size)
+
+    def get(self, row, col):
+        """Retorna o conteúdo da casa (row, col)."""
+        bit = 1 << (row * self.size + col)
+        if self.x & bit:
+            return X
+        if self.o & bit:
+            return O
+        return EMPTY
+
+    def bits(self, player):
+        return self.x if player == X else self.o
+
+    def key(self, player):
+        """Chave de Zobrist da posição incluindo o jogador da vez."""
+        return self.hash ^ self.zside if player == X else self.hash
+
+    def play(self, index, player):
+        """Coloca a peça do jogador na casa de índice ``index``, atualizando as contagens por linha."""
+        k = self.k
+        weights = self.weights
+        score = self.score
+        if player == X:
+            self.x |= 1 << index
+            self.hash ^= self.zx[index]
+            own, other = self.x_counts, self.o_counts
+            for line in self.cell_lines[index]:
+                count = own[line]
+                own[line] = count + 1
+                if other[line] == 0:
+                    score -= weights[count + 1] - weights[count]
+                    if count + 1 == k:
+                        self.x_lines += 1
+                        self.x_threats.discard(line)
+                    elif count + 1 == k - 1:
+                        self.x_threats.add(line)
+                elif count == 0:
+                    score -= weights[other[line]]  # a linha de O deixa de valer
+                    if other[line] == k - 1:
+                        self.o_threats.discard(line)
+        else:
+            self.o |= 1 << index
+            self.hash ^= self.zo[index]
+            own, other = self.o_counts, self.x_counts
+            for line in self.cell_lines[index]:
+                count = own[line]
+                own[line] = count + 1
+                if other[line] == 0:
+                    score += weights[count + 1] - weights[count]
+                    if count + 1 == k:
+                        self.o_lines += 1
+                        self.o_threats.discard(line)
+                    elif count + 1 == k - 1:
+                        self.o_threats.add(line)
+                elif count == 0:
+                    score += weights[other[line]]
+                    if other[line] == k - 1:
+                        self.x_threats.discard(line)
+        self.score = score
+
+    def undo(self, index, player):
+        """Remove a peça do jogador da casa de índice ``index``, desfazendo as contagens por linha."""
+        k = self.k
+        weights = self.weights
+        score = self.score
+        if player == X:
+            self.x &= ~(1 << index)
+            self.hash ^= self.zx[index]
+            own, other = self.x_counts, self.o_counts
+            for line in self.cell_lines[index]:
+                count = own[line] - 1
+                own[line] = count
+                if other[line] == 0:
+                    score += weights[count + 1] - weights[count]
+                    if count + 1 == k:
+                        self.x_lines -= 1
+                        self.x_threats.add(line)
+                    elif count + 1 == k - 1:
+                        self.x_threats.discard(line)
+                elif count == 0:
+                    score += weights[other[line]]
+                    if other[line] == k - 1:
+                        self.o_threats.add(line)
+        else:
+            self.o &= ~(1 << index)
+            self.hash ^= self.zo[index]
+            own, other = self.o_counts, self.x_counts
+            for line in self.cell_lines[index]:
+                count = own[line] - 1
+                own[line] = count
+                if other[line] == 0:
+                    score -= weights[count + 1] - weights[count]
+                    if count + 1 == k:
+                        self.o_lines -= 1
+                        self.o_threats.add(line)
+                    elif count + 1 == k - 1:
+                        self.o_threats.discard(line)
+                elif count == 0:
+                    score -= weights[other[line]]
+                    if other[line] == k - 1:
+                        self.x_threats.add(line)
+        self.score = score
+
+    def empty_mask(self):
+        return self.full & ~(self.x | self.o)
+
+    def empty_cells(self):
+        """Retorna a lista de índices das casas vazias."""
+        return list(iter_bits(self.empty_mask()))
+
+    def candidate_mask(self):
+        """
+        Máscara das casas vazias onde vale a pena jogar: todas no jogo clássico; com
+        k menor que o tamanho, só as que estão a até ``radius`` casas de alguma peça
+        (ou o centro, com o tabuleiro vazio).
+        """
+        empty = self.full & ~(self.x | self.o)
+        if self.radius is None:
+            return empty
+        stones = self.x | self.o
+        if not stones:
+            center = self.size // 2
+            return 1 << (center * self.size + center)
+        not_first, not_last = edge_masks(self.size)
+        size = self.size
+        near = stones
+        for _ in range(self.radius):
+            near |= ((near & not_last) << 1) | ((near & not_first) >> 1)
+            near = (near | (near << size) | (near >> size)) & self.full
+        return near & empty
+
+    def candidate_cells(self):
+        """Retorna a lista de índices das casas de candidate_mask."""
+        return list(iter_bits(self.candidate_mask()))
+
+    def is_full(self):
+        return (self.x | self.o) == self.full
+
+    def has_won(self, player):
+        """Verifica se o jogador completou alguma linha."""
+        return (self.x_lines if player == X else self.o_lines) > 0
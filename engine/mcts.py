@@ -0,0 +1,222 @@
+"""
+Busca em árvore Monte Carlo (MCTS/UCT), alternativa ao minimax para tabuleiros grandes.
+
+Em vez de avaliar as folhas com a heurística, cada iteração desce a árvore pelo
+critério UCT, expande um nó e termina a partida com uma simulação rápida
+(playout) sobre o próprio Bitboard. As simulações são "leves": quem joga
+completa uma linha se puder, senão bloqueia a do adversário, senão joga ao acaso
+entre as casas candidatas. A mesma regra filtra os filhos de cada nó da árvore.
+
+A busca para quando o tempo (``time_budget_ms``) ou o número de simulações
+(``playouts``) se esgota. Com vários workers, cada um cresce a sua própria árvore
+a partir da raiz (paralelismo na raiz) e as visitas das jogadas da raiz são somadas.
+"""
+
+import logging
+import math
+import os
+import random
+import time
+
+from engine.bitboard import O, X, iter_bits
+from engine.ordering import threat_cells
+from engine.search import SearchCancelled
+from engine.stats import SearchStats
+
+logger = logging.getLogger(__name__)
+
+# Constante de exploração do UCT (recompensas entre 0 e 1)
+EXPLORATION = math.sqrt(2)
+# Simulações por jogada no 3x3 quando nem tempo nem número de simulações são
+# dados; nos tabuleiros maiores o número cai com default_playouts
+DEFAULT_PLAYOUTS = 20000
+
+
+class Node:
+    """Nó da árvore: ``move`` foi jogada por ``player``; ``value`` soma as recompensas desse jogador."""
+
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "value")
+
+    def __init__(self, move, player, parent, untried):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.value = 0.0
+
+    def select(self):
+        """Filho com o maior valor UCT."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.value / child.visits
+                   + EXPLORATION * math.sqrt(log_visits / child.visits))
+
+
+def is_terminal(board):
+    return board.x_lines or board.o_lines or board.is_full()
+
+
+def forced_moves(board, player):
+    """
+    Máscara das jogadas consideradas para ``player``: as que vencem, senão as que
+    bloqueiam uma vitória do adversário, senão todas as candidatas.
+    """
+    candidates = board.candidate_mask() or board.empty_mask()
+    wins = threat_cells(board, player) & candidates
+    if wins:
+        return wins
+    blocks = threat_cells(board, O if player == X else X) & candidates
+    return blocks or candidates
+
+
+def playout(board, player, rng):
+    """Termina a partida com jogadas leves a partir de ``player``; retorna o vencedor (ou None) e desfaz tudo."""
+    played = []
+    while not is_terminal(board):
+        moves = list(iter_bits(forced_moves(board, player)))
+        index = moves[rng.randrange(len(moves))]
+        board.play(index, player)
+        played.append((index, player))
+        player = O if player == X else X
+    winner = X if board.x_lines else O if board.o_lines else None
+    for index, mover in reversed(played):
+        board.undo(index, mover)
+    return winner
+
+
+def default_playouts(size):
+    """
+    Simulações padrão para um tabuleiro ``size`` x ``size``: o custo de uma
+    simulação cresce um pouco mais rápido que o número de casas, então o número
+    cai com (9 / casas) ** 1.25 e cada jogada leva mais ou menos o mesmo tempo
+    (cerca de 1 s) do 3x3 ao 15x15.
+    """
+    return max(1, round(DEFAULT_PLAYOUTS * (9 / (size * size)) ** 1.25))
+
+
+def grow_tree(board, player, deadline=None, playouts=None, seed=None, cancel=None):
+    """
+    Cresce uma árvore UCT a partir de ``board`` com ``player`` a jogar, até o
+    ``deadline`` (time.monotonic) ou ``playouts`` simulações. Retorna a raiz.
+    Lança SearchCancelled se ``cancel.is_set()``.
+    """
+    rng = random.Random(seed)
+    opponent = O if player == X else X
+    root = Node(None, opponent, None, list(iter_bits(forced_moves(board, player))))
+    iterations = 0
+    while playouts is None or iterations < playouts:
+        # Uma consulta ao relógio custa pouco perto de uma simulação
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled()
+        if iterations and deadline is not None and time.monotonic() >= deadline:
+            break
+        iterations += 1
+
+        # Seleção
+        node = root
+        path = []
+        while not node.untried and node.children:
+            node = node.select()
+            board.play(node.move, node.player)
+            path.append(node)
+
+        # Expansão
+        if node.untried and not is_terminal(board):
+            index = node.untried.pop(rng.randrange(len(node.untried)))
+            mover = O if node.player == X else X
+            board.play(index, mover)
+            untried = [] if is_terminal(board) else list(iter_bits(forced_moves(board, node.player)))
+            child = Node(index, mover, node, untried)
+            node.children.append(child)
+            node = child
+            path.append(node)
+
+        # Simulação
+        if is_terminal(board):
+            winner = X if board.x_lines else O if board.o_lines else None
+        else:
+            winner = playout(board, O if node.player == X else X, rng)
+
+        # Retropropagação
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.value += 0.5
+            elif winner == node.player:
+                node.value += 1.0
+            node = node.parent
+        for visited in reversed(path):
+            board.undo(visited.move, visited.player)
+    return root
+
+
+def root_statistics(root):
+    """Retorna {jogada: (visitas, soma das recompensas)} dos filhos da raiz."""
+    return {child.move: (child.visits, child.value) for child in root.children}
+
+
+def _mcts_task(args, cancel):
+    """Tarefa de um worker (EnginePool.map_tasks): cresce uma árvore independente."""
+    board, wall_deadline, playouts, seed = args
+    deadline = None if wall_deadline is None else time.monotonic() + (wall_deadline - time.time())
+    root = grow_tree(board, O, deadline, playouts, seed, cancel)
+    stats = SearchStats()
+    stats.nodes = root.visits
+    return {"moves": root_statistics(root), "stats": stats.counters(), "pid": os.getpid()}
+
+
+def mcts_move(board, time_budget_ms=None, playouts=None, num_workers=1, pool=None, stats=None, cancel=None,
+              seed=None):
+    """
+    Escolhe a jogada do computador (O) em um Bitboard com MCTS; retorna
+    (índice, valor) ou None se não houver jogadas. O valor é a recompensa média
+    da jogada para O, de -1 (derrota) a 1 (vitória). Sem ``time_budget_ms`` nem
+    ``playouts``, faz default_playouts simulações.
+    Com ``pool`` (EnginePool) ou ``num_workers`` > 1 (fora do 3x3), cada worker cresce uma árvore
+    (com a sua parte das simulações) e as estatísticas da raiz são somadas.
+    Em ``stats`` (SearchStats), ``nodes`` conta as simulações.
+    """
+    if is_terminal(board):
+        return None
+    if time_budget_ms is None and playouts is None:
+        playouts = default_playouts(board.size)
+    board = board.copy()
+    if stats is not None:
+        stats.start()
+
+    temporary_pool = None
+    if pool is None and num_workers > 1 and board.size > 3:
+        from engine.pool import EnginePool  # importado só quando há busca paralela
+        pool = temporary_pool = EnginePool(num_workers, wait_ready=False)
+    try:
+        if pool is None:
+            deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+            root = grow_tree(board, O, deadline, playouts, seed, cancel)
+            totals = root_statistics(root)
+            if stats is not None:
+                stats.nodes += root.visits
+        else:
+            pool.new_search()
+            wall_deadline = None if time_budget_ms is None else time.time() + time_budget_ms / 1000
+            share = None if playouts is None else -(-playouts // pool.num_workers)
+            rng = random.Random(seed)
+            tasks = [(board, wall_deadline, share, rng.getrandbits(32)) for _ in range(pool.num_workers)]
+            totals = {}
+            for result in pool.map_tasks(_mcts_task, tasks, cancel):
+                for move, (visits, value) in result["moves"].items():
+                    old_visits, old_value = totals.get(move, (0, 0.0))
+                    totals[move] = (old_visits + visits, old_value + value)
+                if stats is not None:
+                    stats.merge(result["stats"], result["pid"])
+    finally:
+        if stats is not None:
+            stats.stop()
+        if temporary_pool is not None:
+            temporary_pool.close()
+
+    move, (visits, value) = max(totals.items(), key=lambda item: item[1][0])
+    score = 2 * value / visits - 1
+    logger.info(f"MCTS: {sum(v for v, _ in totals.values())} simulações, melhor jogada {board.coords(move)} "
+                f"com {visits} visitas e valor {score:.3f}")
+    return move, score
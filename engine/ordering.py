@@ -0,0 +1,125 @@
+"""
+Ordenação de jogadas para o minimax com poda alfa-beta.
+
+A poda alfa-beta corta mais quanto antes a melhor jogada é tentada. A ordem de
+cada nó combina várias fontes, em ordem de prioridade:
+
+1. a melhor jogada guardada na tabela de transposição (ou da variante principal);
+2. vitórias imediatas e bloqueios forçados (linhas a uma peça de serem completadas);
+3. jogadas "killer" que causaram corte em nós irmãos da mesma profundidade;
+4. a tabela de histórico (jogadas que causaram cortes em qualquer lugar da árvore);
+5. uma tabela estática de valor das casas (número de linhas que passam pela casa).
+
+As fontes podem ser ligadas ou desligadas individualmente. O ordenador também
+conta em quantos cortes a primeira jogada tentada já foi a responsável.
+"""
+
+from engine.bitboard import O, X, iter_bits
+
+# Prioridades das fontes de ordenação (somadas ao histórico/valor estático)
+TT_MOVE_SCORE = 1 << 40
+WIN_SCORE = 1 << 39
+BLOCK_SCORE = 1 << 38
+KILLER_SCORE = 1 << 37
+
+# Cache da tabela estática por (tamanho, k)
+_SQUARE_VALUES = {}
+
+
+def square_values(size, lines, k=None):
+    """Valor estático de cada casa: quantas linhas vencedoras (de ``k`` casas) passam por ela."""
+    values = _SQUARE_VALUES.get((size, k))
+    if values is None:
+        counts = [0] * (size * size)
+        for mask in lines:
+            for index in iter_bits(mask):
+                counts[index] += 1
+        values = _SQUARE_VALUES[(size, k)] = tuple(counts)
+    return values
+
+
+def threat_cells(board, player):
+    """Retorna a máscara das casas vazias que completam uma linha para o jogador."""
+    lines = board.lines
+    cells = 0
+    for line in (board.x_threats if player == X else board.o_threats):
+        cells |= lines[line]
+    return cells & board.empty_mask()
+
+
+class MoveOrderer:
+    """
+    Ordena as jogadas de cada nó e aprende com os cortes da busca.
+
+    Uma instância pode ser mantida durante toda a partida; ``new_search`` limpa
+    as killers e envelhece o histórico entre uma jogada e outra.
+    """
+
+    def __init__(self, tt_move=True, threats=True, killers=True, history=True, static=True):
+        self.use_tt_move = tt_move
+        self.use_threats = threats
+        self.use_killers = killers
+        self.use_history = history
+        self.use_static = static
+        self.killers = {}
+        self.history = {"X": {}, "O": {}}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """Prepara o ordenador para uma nova busca."""
+        self.killers = {}
+        for table in self.history.values():
+            for index in table:
+                table[index] //= 2
+
+    def order(self, board, player, depth, tt_move=None):
+        """Retorna a lista de casas candidatas (Bitboard.candidate_mask) na ordem em que devem ser tentadas."""
+        empty = board.candidate_mask()
+        scores = {}
+        history = self.history[player] if self.use_history else None
+        values = square_values(board.size, board.lines, board.k) if self.use_static else None
+        for index in iter_bits(empty):
+            score = 0
+            if history is not None:
+                score += history.get(index, 0)
+            if values is not None:
+                score += values[index]
+            scores[index] = score
+
+        if self.use_killers:
+            for slot, killer in enumerate(self.killers.get(depth, ())):
+                if killer in scores:
+                    scores[killer] += KILLER_SCORE >> slot
+        if self.use_threats:
+            opponent = O if player == X else X
+            for index in iter_bits(threat_cells(board, player) & empty):
+                scores[index] += WIN_SCORE
+            for index in iter_bits(threat_cells(board, opponent) & empty):
+                scores[index] += BLOCK_SCORE
+        if self.use_tt_move and tt_move is not None and tt_move in scores:
+            scores[tt_move] += TT_MOVE_SCORE
+
+        return sorted(scores, key=scores.__getitem__, reverse=True)
+
+    def record_cutoff(self, player, depth, index, remaining, move_number):
+        """Registra que a jogada ``index`` (a ``move_number``-ésima tentada) causou um corte."""
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+        if self.use_killers:
+            killers = self.killers.setdefault(depth, [])
+            if index not in killers:
+                killers.insert(0, index)
+                del killers[2:]
+        if self.use_history:
+            table = self.history[player]
+            table[index] = table.get(index, 0) + remaining * remaining
+
+    def stats(self):
+        """Retorna as estatísticas de cortes em um dicionário."""
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+        }
@@ -0,0 +1,115 @@
+"""
+Ponderação: busca em segundo plano durante a vez do jogador humano.
+
+Enquanto o humano (X) pensa, o Ponderer calcula a jogada do computador para as
+respostas mais prováveis dele (as primeiras do MoveOrderer), usando a mesma
+tabela de transposição da partida. As respostas são aprofundadas juntas, uma
+rodada por profundidade, então nenhuma fica sem resultado enquanto outra recebe
+todo o tempo. Quando a jogada real chega, o resultado é reaproveitado se já
+equivale ao da busca normal (a profundidade máxima, ou o orçamento de tempo
+inteiro gasto nessa resposta); senão a busca normal começa com a tabela aquecida.
+"""
+
+import logging
+import threading
+import time
+
+from engine.search import WIN_THRESHOLD, SearchCancelled, choose_move
+from engine.transposition import DEFAULT_TT_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Respostas do humano ponderadas por padrão
+DEFAULT_MAX_REPLIES = 3
+
+
+class Ponderer:
+    """
+    Ponderação cancelável de uma partida. Usa a tabela ``tt``, o ordenador e o
+    pool da busca normal, então ``stop`` deve ser chamado antes de cada busca
+    normal: ele cancela a ponderação e espera a thread terminar.
+    """
+
+    def __init__(self, max_depth, num_workers=1, tt=None, tt_bytes=DEFAULT_TT_BYTES, time_budget_ms=None,
+                 pool=None, orderer=None, max_replies=DEFAULT_MAX_REPLIES):
+        self.max_depth = max_depth
+        self.num_workers = num_workers
+        self.tt = tt
+        self.tt_bytes = tt_bytes
+        self.time_budget_ms = time_budget_ms
+        self.pool = pool
+        self.orderer = orderer
+        self.max_replies = max_replies
+        # (x, o) da posição após a resposta do humano -> ((índice, score) do computador, completo)
+        self.results = {}
+        self.thread = None
+        self.cancel = None
+
+    def start(self, board):
+        """Começa a ponderar a posição ``board`` (Bitboard com X a jogar)."""
+        self.stop()
+        self.results = {}
+        self.cancel = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(board.copy(), self.cancel), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Cancela a ponderação em andamento e espera a thread terminar."""
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            self.cancel.set()
+            thread.join()
+
+    def take(self, board):
+        """
+        Retorna (índice, score) já calculado para ``board`` (O a jogar), se ele for
+        equivalente ao da busca normal, ou None.
+        """
+        best, complete = self.results.get((board.x, board.o), (None, False))
+        return best if complete else None
+
+    def _run(self, board, cancel):
+        tt_entry = self.tt.probe(board.key("X")) if self.tt is not None else None
+        replies = self.orderer.order(board, "X", 0, tt_entry and tt_entry[4]) if self.orderer is not None \
+            else board.candidate_cells()
+        if self.max_replies is not None:
+            replies = replies[:self.max_replies]
+
+        # Profundidade final e tempo já gasto de cada resposta
+        limits = {index: min(self.max_depth, board.empty_mask().bit_count() - 1) for index in replies}
+        spent = dict.fromkeys(replies, 0.0)
+        for depth in range(1, max(limits.values(), default=0) + 1):
+            for index in replies:
+                if depth > limits[index] or self._complete(board, index):
+                    continue
+                board.play(index, "X")
+                try:
+                    if board.x_lines or board.is_full():
+                        continue
+                    started = time.perf_counter()
+                    best = choose_move(board, depth, self.num_workers, self.tt, self.tt_bytes, None, self.pool,
+                                       self.orderer, cancel=cancel)
+                    spent[index] += time.perf_counter() - started
+                    if best is not None:
+                        complete = depth == limits[index] or abs(best[1]) >= WIN_THRESHOLD or (
+                            self.time_budget_ms is not None and spent[index] * 1000 >= self.time_budget_ms)
+                        self.results[(board.x, board.o)] = (best, complete)
+                        logger.debug(f"Ponderação: resposta {board.coords(index)} na profundidade {depth} -> "
+                                     f"{board.coords(best[0])} com score {best[1]}")
+                except SearchCancelled:
+                    return
+                except Exception as e:
+                    # A ponderação é só uma otimização: um erro aqui não interrompe a partida
+                    logger.error(f"Erro na ponderação: {e}")
+                    return
+                finally:
+                    board.undo(index, "X")
+        logger.info(f"Ponderação completa: {len(self.results)} respostas calculadas")
+
+    def _complete(self, board, index):
+        """Indica se a resposta ``index`` do humano em ``board`` já tem resultado completo."""
+        board.play(index, "X")
+        try:
+            return self.take(board) is not None
+        finally:
+            board.undo(index, "X")
@@ -0,0 +1,267 @@
+"""
+Pool de processos da busca paralela.
+
+Os workers importam apenas o pacote engine (nunca a interface gráfica) e
+mantêm a sua tabela de transposição e o seu ordenador de jogadas durante
+toda a vida do pool.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+
+from engine.bitboard import Bitboard
+from engine.ordering import MoveOrderer
+from engine.search import SearchCancelled, SearchTimeout, minimax
+from engine.stats import SearchStats
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
+
+logger = logging.getLogger(__name__)
+
+# Estado de cada processo worker (criado em _init_worker): tabela de transposição,
+# ponto de divisão compartilhado entre os workers e a busca atual
+_worker_tt = None
+_worker_orderer = None
+_split_state = None
+_split_values = None
+_worker_search_id = None
+_worker_reset_id = 0
+_worker_board = None
+
+def _init_worker(tt_bytes, split_state, ready_queue=None):
+    """
+    Inicializa o worker com a sua própria tabela de transposição, ordenador e o estado compartilhado.
+    Avisa pela ``ready_queue`` (pid, time.time()) quando está pronto, para medir o tempo de criação.
+    """
+    global _worker_tt, _worker_orderer, _split_state, _split_values
+    _worker_tt = TranspositionTable(tt_bytes)
+    _worker_orderer = MoveOrderer()
+    _split_state = split_state
+    _split_values = split_state.get_obj()  # leitura sem trava, usada a cada nó
+    if ready_queue is not None:
+        ready_queue.put((os.getpid(), time.time()))
+
+def _position_board(position):
+    """
+    Bitboard da posição (size, k, x, o) de uma tarefa. Os irmãos de um nó dividido
+    partem da mesma posição, então o tabuleiro da tarefa anterior é reaproveitado
+    (cada tarefa desfaz a sua jogada) em vez de recriado a cada tarefa.
+    """
+    global _worker_board
+    if _worker_board is None or (_worker_board.size, _worker_board.k, _worker_board.x, _worker_board.o) != position:
+        size, k, x, o = position
+        _worker_board = Bitboard(size, x, o, k)
+    return _worker_board
+
+class _CancelFlag:
+    """
+    Pedido de cancelamento da busca ``search_id`` visto de dentro do worker
+    (EnginePool.cancel_search); tem a mesma interface de threading.Event.is_set.
+    """
+    
+    def __init__(self, search_id):
+        self.search_id = search_id
+    
+    def is_set(self):
+        return _split_values[3] == self.search_id
+
+def evaluate_move(args):
+    """
+    Avalia uma jogada de um nó dividido (split point) em um processo separado.
+    A posição chega compactada em (size, k, x, o), alguns bytes por tarefa.
+    A janela da busca é apertada com o melhor score do nó já encontrado pelos
+    outros workers (memória compartilhada), e o próprio score é publicado ao
+    terminar. Se o nó já sofreu corte, a jogada é pulada ("skipped").
+    Se o prazo ``wall_deadline`` (em time.time, comum a todos os processos) for
+    atingido, retorna a jogada com score None.
+    Com ``collect_stats``, o resultado traz também o pid do worker e os contadores
+    da busca ("stats"). ``pvs`` é repassado ao minimax.
+    """
+    global _worker_orderer, _worker_search_id, _worker_reset_id, _worker_board
+    try:
+        (position, index, current_player, alpha, beta, depth, max_depth, wall_deadline, search_id, split_id,
+         collect_stats, pvs) = args
+        board = _position_board(position)
+        row, col = board.coords(index)
+        logger.debug(f"Avaliando movimento ({row}, {col}) para jogador {current_player}")
+        deadline = None if wall_deadline is None else time.monotonic() + (wall_deadline - time.time())
+        if _split_state[2] != _worker_reset_id:
+            # O pool pediu tabelas vazias (EnginePool.clear_tables)
+            _worker_reset_id = _split_state[2]
+            _worker_tt.clear()
+            _worker_orderer = MoveOrderer()
+        if search_id != _worker_search_id:
+            _worker_search_id = search_id
+            _worker_tt.new_search()
+            _worker_orderer.new_search()
+        
+        # Os scores são inteiros: com a janela aberta em 1 além do melhor, jogadas
+        # empatadas com a melhor ainda recebem o score exato, e as piores ficam abaixo dela
+        with _split_state.get_lock():
+            if _split_state[0] == split_id:
+                if current_player == "O":
+                    alpha = max(alpha, _split_state[1] - 1)
+                else:
+                    beta = min(beta, _split_state[1] + 1)
+        cancel = _CancelFlag(search_id)
+        if beta <= alpha or cancel.is_set():
+            return {"row": row, "col": col, "score": None, "skipped": True}
+        
+        board.play(index, current_player)
+        
+        # Avalia a posição resultante
+        next_player = "O" if current_player == "X" else "X"
+        stats = SearchStats() if collect_stats else None
+        try:
+            score = minimax(board, next_player, alpha, beta, depth + 1, max_depth,
+                            next_player == "O", _worker_tt, deadline, _worker_orderer, stats, cancel, pvs)
+        except SearchTimeout:
+            # A busca interrompida deixa jogadas no tabuleiro: ele é recriado na próxima tarefa
+            _worker_board = None
+            score = None
+        else:
+            board.undo(index, current_player)
+        
+        result = {"row": row, "col": col, "score": score, "skipped": False}
+        if stats is not None:
+            result.update(pid=os.getpid(), stats=stats.counters())
+        if score is None:
+            return result
+        
+        with _split_state.get_lock():
+            if _split_state[0] == split_id:
+                if (score > _split_state[1]) if current_player == "O" else (score < _split_state[1]):
+                    _split_state[1] = score
+        
+        return result
+    except Exception as e:
+        _worker_board = None
+        logger.error(f"Erro em evaluate_move: {e}")
+        raise
+
+def _run_task(task):
+    """Executa no worker uma tarefa de EnginePool.map_tasks, passando o pedido de cancelamento."""
+    function, search_id, args = task
+    return function(args, _CancelFlag(search_id))
+
+class EnginePool:
+    """
+    Pool de processos de busca reaproveitado entre as jogadas de uma partida.
+    Cada worker mantém a sua tabela de transposição durante toda a vida do pool.
+    Os irmãos de um nó dividido são distribuídos por uma fila única: cada worker
+    livre pega a próxima jogada pendente, mantendo todos ocupados.
+    """
+    
+    def __init__(self, num_workers, tt_bytes=DEFAULT_TT_BYTES, wait_ready=True):
+        """
+        Cria os workers. Com ``wait_ready``, espera todos ficarem prontos e guarda
+        em ``spawn_seconds`` o tempo até o último deles terminar de inicializar.
+        """
+        self.num_workers = num_workers
+        # [id do nó dividido atual, melhor score encontrado nele, pedidos de limpeza das
+        # tabelas, última busca cancelada]
+        self.split_state = multiprocessing.Array("i", [0, 0, 0, 0])
+        ready_queue = multiprocessing.Queue() if wait_ready else None
+        started = time.time()
+        self.pool = multiprocessing.Pool(processes=num_workers, initializer=_init_worker,
+                                         initargs=(tt_bytes, self.split_state, ready_queue))
+        self.search_id = 0
+        self.split_id = 0
+        self.spawn_seconds = None
+        if ready_queue is not None:
+            ready = [ready_queue.get(timeout=60)[1] for _ in range(num_workers)]
+            self.spawn_seconds = max(ready) - started
+            logger.info(f"Pool de busca criado com {num_workers} workers em {self.spawn_seconds * 1000:.0f} ms")
+        else:
+            logger.info(f"Pool de busca criado com {num_workers} workers")
+    
+    def new_search(self):
+        """Marca o início de uma nova busca (os workers envelhecem as suas tabelas)."""
+        self.search_id += 1
+    
+    def clear_tables(self):
+        """Faz cada worker esvaziar a sua tabela e o seu ordenador antes da próxima tarefa."""
+        with self.split_state.get_lock():
+            self.split_state[2] += 1
+    
+    def cancel_search(self):
+        """Interrompe as tarefas da busca atual nos workers (as pendentes são puladas)."""
+        with self.split_state.get_lock():
+            self.split_state[3] = self.search_id
+    
+    def search_siblings(self, board, current_player, moves, alpha, beta, depth, max_depth, best, deadline=None,
+                        stats=None, cancel=None, pvs=False):
+        """
+        Avalia em paralelo as jogadas ``moves`` de um nó cujo primeiro filho já foi
+        buscado (com score ``best``). Retorna a lista de (índice, score) das jogadas
+        avaliadas; jogadas puladas por corte não aparecem.
+        Lança SearchTimeout se o deadline for atingido.
+        Os contadores dos workers são somados em ``stats`` (SearchStats), por pid.
+        Se ``cancel`` (threading.Event) for ativado, cancela a busca nos workers e
+        lança SearchCancelled. Com ``pvs``, os workers buscam com PVS (minimax).
+        """
+        if self.pool is None:
+            raise RuntimeError("Pool de busca encerrado")
+        self.split_id += 1
+        with self.split_state.get_lock():
+            self.split_state[0] = self.split_id
+            self.split_state[1] = best
+        wall_deadline = None if deadline is None else time.time() + (deadline - time.monotonic())
+        position = (board.size, board.k, board.x, board.o)
+        args = [(position, index, current_player, alpha, beta, depth, max_depth, wall_deadline,
+                 self.search_id, self.split_id, stats is not None, pvs) for index in moves]
+        
+        results = []
+        iterator = self.pool.imap(evaluate_move, args, chunksize=1)
+        while len(results) < len(args):
+            try:
+                results.append(iterator.next(timeout=0.1))
+            except multiprocessing.TimeoutError:
+                # Permite abandonar a busca se o pool for encerrado no meio dela
+                if self.pool is None:
+                    raise RuntimeError("Pool de busca encerrado")
+            if cancel is not None and cancel.is_set():
+                self.cancel_search()
+                raise SearchCancelled()
+        
+        if stats is not None:
+            for result in results:
+                if "stats" in result:
+                    stats.merge(result["stats"], result["pid"])
+        if any(result["score"] is None and not result["skipped"] for result in results):
+            raise SearchTimeout()
+        return [(board.index(result["row"], result["col"]), result["score"])
+                for result in results if not result["skipped"]]
+    
+    def map_tasks(self, function, args, cancel=None):
+        """
+        Executa ``function(arg, cancel_flag)`` nos workers para cada item de ``args`` e
+        retorna a lista de resultados na mesma ordem. ``function`` deve ser uma função
+        de módulo (serializável); ``cancel_flag.is_set()`` indica que a busca atual foi
+        cancelada. Se ``cancel`` (threading.Event) for ativado, cancela as tarefas e
+        lança SearchCancelled.
+        """
+        if self.pool is None:
+            raise RuntimeError("Pool de busca encerrado")
+        tasks = [(function, self.search_id, arg) for arg in args]
+        results = []
+        iterator = self.pool.imap(_run_task, tasks, chunksize=1)
+        while len(results) < len(tasks):
+            try:
+                results.append(iterator.next(timeout=0.1))
+            except multiprocessing.TimeoutError:
+                if self.pool is None:
+                    raise RuntimeError("Pool de busca encerrado")
+            if cancel is not None and cancel.is_set():
+                self.cancel_search()
+                raise SearchCancelled()
+        return results
+    
+    def close(self):
+        """Encerra os workers, interrompendo uma busca em andamento."""
+        if self.pool is not None:
+            pool, self.pool = self.pool, None
+            pool.terminate()
+            pool.join()
+            logger.info("Pool de busca encerrado")
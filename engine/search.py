@@ -0,0 +1,569 @@
+"""
+Busca do computador: minimax com poda alfa-beta sobre o Bitboard.
+
+Módulo sem dependência da interface gráfica e sem efeitos colaterais na
+importação; é usado pelos dois jogos e pelos processos workers. O pool de
+processos (engine.pool) só é importado quando uma busca paralela é pedida.
+"""
+
+import logging
+import time
+
+from engine.bitboard import Bitboard, line_score
+from engine.ordering import MoveOrderer
+from engine.solver import DEFAULT_SOLVER_NODES, DRAW, SOLVER_MAX_EMPTY, WIN, solve
+from engine.symmetry import unique_moves
+from engine.transposition import (DEFAULT_TT_BYTES, EXACT, LOWER, UPPER, WIN_THRESHOLD, TranspositionTable,
+                                  score_from_tt, score_to_tt)
+
+logger = logging.getLogger(__name__)
+
+# Profundidade restante mínima para dividir um nó entre os workers; abaixo disso
+# a busca é serial, pois o custo de enviar a tarefa supera o da própria busca
+MIN_SPLIT_DEPTH = 3
+
+# Algoritmos aceitos por computer_move
+ALGORITHMS = ("minimax", "mcts")
+
+# Estratégias de janela do minimax: alfa-beta com a janela inteira, PVS (janela
+# nula nos irmãos depois do primeiro) e MTD(f) (só janelas nulas na raiz, guiadas
+# pelo score da iteração anterior)
+STRATEGIES = ("alphabeta", "pvs", "mtdf")
+
+# Maior valor absoluto da avaliação heurística nas folhas: fica abaixo de
+# WIN_THRESHOLD para nunca ser confundida com uma vitória forçada
+HEURISTIC_LIMIT = WIN_THRESHOLD - 1
+
+class SearchTimeout(Exception):
+    """Lançada dentro do minimax quando o tempo da busca se esgota."""
+
+class SearchCancelled(SearchTimeout):
+    """Lançada dentro do minimax quando a busca é cancelada (``cancel.is_set()``)."""
+
+def minimax(board, current_player, alpha, beta, depth, max_depth, is_maximizing, tt=None, deadline=None,
+            orderer=None, stats=None, cancel=None, pvs=False):
+    """
+    Algoritmo minimax com poda alfa-beta simplificado.
+    Trabalha sobre um Bitboard, fazendo e desfazendo as jogadas no próprio tabuleiro.
+    Se uma tabela de transposição for passada, consulta e guarda os resultados de
+    cada posição (com a profundidade restante e o tipo de limite).
+    Se ``deadline`` (time.monotonic) for passado, lança SearchTimeout quando for ultrapassado.
+    Com um MoveOrderer, as jogadas são ordenadas por ele e os cortes são registrados nele;
+    sem ele, apenas a jogada da tabela de transposição é tentada primeiro.
+    Com um SearchStats em ``stats``, conta os nós, folhas, cortes e consultas à tabela.
+    ``cancel`` é um threading.Event (ou objeto com is_set()); quando ele é ativado,
+    a busca é interrompida com SearchCancelled.
+    Com ``pvs`` (Principal Variation Search), só a primeira jogada de cada nó é
+    buscada com a janela inteira; as demais são testadas com uma janela nula e só
+    são buscadas de novo se o teste mostrar que podem ser melhores.
+    """
+    try:
+        if stats is not None:
+            stats.count_node(board, depth, max_depth)
+        
+        # Verifica condições de término (contagens por linha mantidas pelo Bitboard)
+        if board.x_lines:
+            return -1000 + depth  # Vitória do adversário (quanto mais rápido, melhor)
+        elif board.o_lines:
+            return 1000 - depth   # Vitória do computador (quanto mais rápido, melhor)
+        elif board.is_full():
+            return 0  # Empate
+        elif depth >= max_depth:
+            # Avaliação heurística (soma corrente de evaluate_position), limitada a HEURISTIC_LIMIT
+            score = board.score
+            if -HEURISTIC_LIMIT <= score <= HEURISTIC_LIMIT:
+                return score
+            return HEURISTIC_LIMIT if score > 0 else -HEURISTIC_LIMIT
+        
+        if deadline is not None and time.monotonic() >= deadline:
+            raise SearchTimeout()
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled()
+        
+        remaining = max_depth - depth
+        
+        # Consulta a tabela de transposição
+        tt_move = None
+        if tt is not None:
+            key = board.key(current_player)
+            entry = tt.probe(key)
+            if stats is not None:
+                stats.tt_probes += 1
+                stats.tt_hits += entry is not None
+            if entry is not None:
+                tt_move = entry[4]
+                if entry[1] >= remaining:
+                    tt_score = score_from_tt(entry[2], depth)
+                    if entry[3] == EXACT:
+                        alpha = beta = tt_score
+                    elif entry[3] == LOWER:
+                        alpha = max(alpha, tt_score)
+                    else:
+                        beta = min(beta, tt_score)
+                    if beta <= alpha:
+                        if stats is not None:
+                            stats.tt_cutoffs += 1
+                        return tt_score
+            alpha_start, beta_start = alpha, beta
+        
+        # Ordena as jogadas; sem ordenador, tenta primeiro a melhor jogada conhecida
+        if orderer is not None:
+            empty_cells = orderer.order(board, current_player, depth, tt_move)
+        else:
+            empty_cells = board.candidate_cells()
+            if tt_move is not None and tt_move in empty_cells:
+                empty_cells.remove(tt_move)
+                empty_cells.insert(0, tt_move)
+        
+        best_move = None
+        if current_player == "O":  # Maximizando (computador)
+            best_eval = -float('inf')
+            for move_number, index in enumerate(empty_cells):
+                board.play(index, "O")
+                if pvs and move_number:
+                    # Os scores são inteiros: a janela (alpha, alpha + 1) só diz se a jogada supera alpha
+                    eval_score = minimax(board, "X", alpha, alpha + 1, depth + 1, max_depth, False, tt, deadline,
+                                         orderer, stats, cancel, pvs)
+                    if alpha < eval_score < beta:
+                        eval_score = minimax(board, "X", alpha, beta, depth + 1, max_depth, False, tt, deadline,
+                                             orderer, stats, cancel, pvs)
+                else:
+                    eval_score = minimax(board, "X", alpha, beta, depth + 1, max_depth, False, tt, deadline,
+                                         orderer, stats, cancel, pvs)
+                board.undo(index, "O")
+                if eval_score > best_eval:
+                    best_eval = eval_score
+                    best_move = index
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    if orderer is not None:
+                        orderer.record_cutoff("O", depth, index, remaining, move_number)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        else:  # Minimizando (jogador)
+            best_eval = float('inf')
+            for move_number, index in enumerate(empty_cells):
+                board.play(index, "X")
+                if pvs and move_number:
+                    eval_score = minimax(board, "O", beta - 1, beta, depth + 1, max_depth, True, tt, deadline,
+                                         orderer, stats, cancel, pvs)
+                    if alpha < eval_score < beta:
+                        eval_score = minimax(board, "O", alpha, beta, depth + 1, max_depth, True, tt, deadline,
+                                             orderer, stats, cancel, pvs)
+                else:
+                    eval_score = minimax(board, "O", alpha, beta, depth + 1, max_depth, True, tt, deadline,
+                                         orderer, stats, cancel, pvs)
+                board.undo(index, "X")
+                if eval_score < best_eval:
+                    best_eval = eval_score
+                    best_move = index
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    if orderer is not None:
+                        orderer.record_cutoff("X", depth, index, remaining, move_number)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        
+        # Guarda o resultado com o tipo de limite em relação à janela usada
+        if tt is not None:
+            if best_eval <= alpha_start:
+                flag = UPPER
+            elif best_eval >= beta_start:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, remaining, score_to_tt(best_eval, depth), flag, best_move)
+        
+        return best_eval
+            
+    except SearchTimeout:
+        raise
+    except Exception as e:
+        logger.error(f"Erro em minimax: {e}")
+        raise
+
+def check_win_state(board, player, k=None):
+    """
+    Verifica se o jogador venceu (aceita lista de listas ou Bitboard). ``k`` é o
+    número de peças em linha para vencer na lista de listas (padrão: o tamanho).
+    """
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_rows(board, k)
+    return board.has_won(player)
+
+def evaluate_position(board, k=None):
+    """
+    Avaliação heurística simples da posição (aceita lista de listas ou Bitboard).
+    Pontos positivos para o computador (O), negativos para o jogador (X).
+    Conta as peças de cada jogador em cada linha usando as máscaras do Bitboard e
+    soma o peso da linha (Bitboard.weights) para quem for o único a ocupá-la.
+    A busca usa ``board.score``, que o Bitboard mantém igual a este valor a cada jogada.
+    ``k`` é o número de peças em linha para vencer na lista de listas (padrão: o tamanho).
+    """
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_rows(board, k)
+    score = 0
+    x, o = board.x, board.o
+    
+    # Pontua cada linha, coluna e diagonal
+    for mask in board.lines:
+        score += line_score((x & mask).bit_count(), (o & mask).bit_count(), board.weights)
+    
+    return score
+
+def pv_split(board, current_player, alpha, beta, depth, max_depth, pool, tt=None, deadline=None, orderer=None,
+             stats=None, cancel=None, pvs=False):
+    """
+    Busca alfa-beta paralela por divisão na variante principal (PV-split / Young
+    Brothers Wait): o primeiro filho de cada nó é buscado antes (recursivamente,
+    dividindo também os nós abaixo dele) para estabelecer o limite, e só então os
+    irmãos restantes são entregues aos workers do ``pool`` com a janela apertada.
+    Nós com profundidade restante menor que MIN_SPLIT_DEPTH são buscados em série.
+    Retorna o score do nó (do ponto de vista do computador, O). ``pvs`` é repassado
+    ao minimax, no processo atual e nos workers.
+    """
+    if (max_depth - depth < MIN_SPLIT_DEPTH or board.has_won("X") or board.has_won("O")
+            or board.is_full()):
+        return minimax(board, current_player, alpha, beta, depth, max_depth, current_player == "O", tt, deadline,
+                       orderer, stats, cancel, pvs)
+    
+    if stats is not None:
+        stats.nodes += 1
+        stats.splits += 1
+    tt_move = None
+    if tt is not None:
+        entry = tt.probe(board.key(current_player))
+        if entry is not None:
+            tt_move = entry[4]
+    if orderer is not None:
+        moves = orderer.order(board, current_player, depth, tt_move)
+    else:
+        moves = board.candidate_cells()
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+    
+    # O irmão mais velho é buscado primeiro, sozinho
+    next_player = "O" if current_player == "X" else "X"
+    first = moves[0]
+    board.play(first, current_player)
+    try:
+        best = pv_split(board, next_player, alpha, beta, depth + 1, max_depth, pool, tt, deadline, orderer, stats,
+                        cancel, pvs)
+    finally:
+        board.undo(first, current_player)
+    best_move = first
+    alpha_start, beta_start = alpha, beta
+    if current_player == "O":
+        alpha = max(alpha, best)
+    else:
+        beta = min(beta, best)
+    
+    # Os irmãos mais novos esperam o limite e são divididos entre os workers
+    if beta > alpha and len(moves) > 1:
+        for index, score in pool.search_siblings(board, current_player, moves[1:], alpha, beta,
+                                                 depth, max_depth, best, deadline, stats, cancel, pvs):
+            if (score > best) if current_player == "O" else (score < best):
+                best, best_move = score, index
+    
+    if tt is not None:
+        if best <= alpha_start:
+            flag = UPPER
+        elif best >= beta_start:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(board.key(current_player), max_depth - depth, score_to_tt(best, depth), flag, best_move)
+    return best
+
+def search_root(board, moves, max_depth, tt=None, pool=None, deadline=None, orderer=None, stats=None,
+                cancel=None, strategy="alphabeta", guess=0):
+    """
+    Avalia cada jogada da raiz para o computador (O) até a profundidade max_depth.
+    Retorna a lista de (índice, score) na ordem de ``moves``. Com ``pool`` (EnginePool),
+    a primeira jogada é buscada com pv_split e as demais são divididas entre os workers.
+    Lança SearchTimeout se o deadline for atingido.
+    Jogadas piores que a melhor já encontrada recebem apenas um limite superior.
+    ``strategy`` é uma de STRATEGIES; com "mtdf" a busca é feita por mtdf a partir
+    de ``guess``, sempre em série.
+    """
+    if strategy == "mtdf":
+        return mtdf(board, moves, guess, max_depth, tt, deadline, orderer, stats, cancel)
+    pvs = strategy == "pvs"
+    if pool is not None:
+        pool.new_search()
+        first = moves[0]
+        board.play(first, "O")
+        try:
+            score = pv_split(board, "X", -float('inf'), float('inf'), 1, max_depth, pool, tt, deadline, orderer,
+                             stats, cancel, pvs)
+        finally:
+            board.undo(first, "O")
+        results = [(first, score)]
+        if len(moves) > 1:
+            results += pool.search_siblings(board, "O", moves[1:], -float('inf'), float('inf'),
+                                            0, max_depth, score, deadline, stats, cancel, pvs)
+        return results
+    
+    results = []
+    best_score = -float('inf')
+    for move_number, index in enumerate(moves):
+        board.play(index, "O")
+        try:
+            if pvs and move_number:
+                # Janela nula: basta saber se a jogada empata ou supera a melhor
+                score = minimax(board, "X", best_score - 1, best_score, 1, max_depth, False, tt, deadline, orderer,
+                                stats, cancel, pvs)
+                if score >= best_score:
+                    score = minimax(board, "X", best_score - 1, float('inf'), 1, max_depth, False, tt, deadline,
+                                    orderer, stats, cancel, pvs)
+            else:
+                score = minimax(board, "X", best_score - 1, float('inf'), 1, max_depth, False, tt, deadline,
+                                orderer, stats, cancel, pvs)
+        finally:
+            board.undo(index, "O")
+        best_score = max(best_score, score)
+        results.append((index, score))
+    return results
+
+def mtdf(board, moves, guess, max_depth, tt=None, deadline=None, orderer=None, stats=None, cancel=None):
+    """
+    MTD(f): encontra o score da raiz só com buscas de janela nula, partindo de
+    ``guess`` (normalmente o score da profundidade anterior). Cada passada diz se o
+    score é maior ou menor que o palpite, e os limites se fecham até se encontrarem.
+    A tabela de transposição ``tt`` guarda o trabalho entre as passadas.
+    Retorna a lista de (índice, score) como search_root, mas com a melhor jogada
+    primeiro (com o score exato); as demais seguem a ordem de ``moves`` e recebem
+    apenas um limite superior, que pode empatar com o da melhor.
+    """
+    lower, upper = -float('inf'), float('inf')
+    score = guess
+    best_move = None
+    values = {}
+    order = list(moves)
+    while lower < upper:
+        beta = score + 1 if score == lower else score
+        score = -float('inf')
+        for index in order:
+            board.play(index, "O")
+            try:
+                value = minimax(board, "X", beta - 1, beta, 1, max_depth, False, tt, deadline, orderer, stats,
+                                cancel)
+            finally:
+                board.undo(index, "O")
+            values[index] = value
+            if value > score:
+                score, move = value, index
+            if value >= beta:
+                break
+        if score < beta:
+            upper = score
+        else:
+            lower = score
+            best_move = move
+            # A jogada que passou do palpite é tentada primeiro na próxima passada
+            order.remove(move)
+            order.insert(0, move)
+    return [(best_move, score)] + [(index, min(values.get(index, -float('inf')), score))
+                                   for index in moves if index != best_move]
+
+def iterative_deepening(board, moves, time_budget_ms, tt=None, pool=None, max_depth=None, orderer=None,
+                        stats=None, cancel=None, strategy="alphabeta"):
+    """
+    Busca com aprofundamento iterativo limitada por tempo.
+    Procura com profundidade 1, 2, 3... até o tempo acabar e retorna (índice, score)
+    da melhor jogada da iteração mais profunda completa. Cada iteração começa pelas
+    jogadas mais bem avaliadas na anterior. A profundidade 1 sempre é completada,
+    a menos que a busca seja cancelada (SearchCancelled é repassada ao chamador).
+    Sem ``time_budget_ms``, vai até ``max_depth``. Com ``strategy`` "mtdf", o score
+    de cada iteração é o palpite inicial da seguinte.
+    """
+    deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+    # Não adianta procurar além do número de casas vazias
+    limit = bin(board.empty_mask()).count("1")
+    if max_depth is not None:
+        limit = min(limit, max_depth)
+    
+    order = list(moves)
+    best = None
+    for depth in range(1, limit + 1):
+        try:
+            results = search_root(board, order, depth, tt, pool, None if depth == 1 else deadline, orderer, stats,
+                                  cancel, strategy, 0 if best is None else best[1])
+        except SearchCancelled:
+            raise
+        except SearchTimeout:
+            logger.info(f"Tempo esgotado durante a profundidade {depth}")
+            break
+        # Ordenação estável: empates mantêm a ordem da iteração anterior
+        results.sort(key=lambda result: result[1], reverse=True)
+        order = [index for index, _ in results]
+        best = results[0]
+        if stats is not None:
+            stats.record_depth(depth)
+        logger.info(f"Profundidade {depth} completa: melhor jogada {board.coords(best[0])} com score {best[1]}")
+        # Vitória ou derrota forçada: procurar mais fundo não muda o resultado
+        if abs(best[1]) >= WIN_THRESHOLD:
+            break
+    return best
+
+def choose_move(board, max_depth, num_workers=1, tt=None, tt_bytes=DEFAULT_TT_BYTES, time_budget_ms=None,
+                pool=None, orderer=None, stats=None, cancel=None, strategy="alphabeta",
+                solver_nodes=DEFAULT_SOLVER_NODES, use_tablebase=True):
+    """
+    Escolhe a jogada do computador (O) em um Bitboard; retorna (índice, score) ou
+    None se não houver casas vazias. Os parâmetros são os de computer_move.
+    """
+    # A busca é feita em uma cópia: se for interrompida (tempo esgotado ou
+    # cancelamento), as jogadas em andamento não são desfeitas no tabuleiro
+    board = board.copy()
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia desconhecida: {strategy!r}")
+    if strategy == "mtdf" and tt is None:
+        tt = TranspositionTable(tt_bytes)  # as passadas do MTD(f) dependem da tabela
+    if tt is not None:
+        tt.new_search()
+    if orderer is None:
+        orderer = MoveOrderer()
+    orderer.new_search()
+    
+    # Avalia apenas um representante de cada grupo de jogadas simétricas,
+    # na ordem sugerida pelo ordenador
+    move_groups = unique_moves(board)
+    representatives = {index for index, _ in move_groups}
+    tt_entry = tt.probe(board.key("O")) if tt is not None else None
+    empty_cells = [index for index in orderer.order(board, "O", 0, tt_entry and tt_entry[4])
+                   if index in representatives]
+    
+    if not empty_cells:
+        return None
+    logger.info(f"Jogadas na raiz: {len(empty_cells)} após simetria "
+                f"({sum(len(orbit) for _, orbit in move_groups)} casas vazias)")
+    
+    # No 4x4 clássico, a tablebase (se o arquivo existir) dá a jogada perfeita sem busca
+    if use_tablebase and board.size == 4 and board.k == 4:
+        from engine.tablebase import probe_move  # importado só no 4x4
+        if stats is not None:
+            stats.start()
+        best = probe_move(board, "O")
+        if stats is not None:
+            if best is not None:
+                stats.nodes += 1 + board.empty_mask().bit_count()  # a posição e cada filho consultados
+            stats.stop()
+        if best is not None:
+            logger.info(f"Jogada da tablebase: {board.coords(best[0])} com score {best[1]}")
+            return best
+    
+    # Uma vitória ou um empate provados pelo solucionador dispensam a busca; na
+    # derrota provada, a busca ainda escolhe a jogada que resiste mais. Ele só roda
+    # nos tabuleiros clássicos com poucas casas vazias, e o tempo gasto nele sai do
+    # orçamento da busca
+    deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+    if solver_nodes and board.k == board.size and board.empty_mask().bit_count() <= SOLVER_MAX_EMPTY:
+        if stats is not None:
+            stats.start()
+        result, move, score, nodes = solve(board, "O", solver_nodes, deadline, cancel)
+        if stats is not None:
+            stats.nodes += nodes
+            stats.stop()
+        if result in (WIN, DRAW):
+            logger.info(f"Posição resolvida ({result}) em {nodes} nós: jogada {board.coords(move)} "
+                        f"com score {score}")
+            return move, score
+    
+    # Com um pool do chamador, a busca é sempre dividida entre os workers (pv_split
+    # decide em que nós vale a pena). Sem ele, tabuleiros pequenos ou com poucas
+    # jogadas não compensam criar um pool temporário
+    temporary_pool = None
+    if strategy == "mtdf":
+        pool = None  # o MTD(f) é sempre serial
+    elif pool is None and len(empty_cells) > 4 and board.size > 3 and num_workers > 1:
+        from engine.pool import EnginePool  # importado só quando há busca paralela
+        pool = temporary_pool = EnginePool(num_workers, tt_bytes, wait_ready=False)
+    
+    if stats is not None:
+        stats.start()
+    try:
+        if time_budget_ms is not None or strategy == "mtdf":
+            # O MTD(f) com profundidade fixa também aprofunda aos poucos, para ter o palpite de cada profundidade
+            if deadline is not None:
+                time_budget_ms = max(0.0, (deadline - time.monotonic()) * 1000)
+            best = iterative_deepening(board, empty_cells, time_budget_ms, tt, pool, max_depth, orderer, stats,
+                                       cancel, strategy)
+        else:
+            results = search_root(board, empty_cells, max_depth, tt, pool, None, orderer, stats, cancel, strategy)
+            best = max(results, key=lambda result: result[1])
+            if stats is not None:
+                stats.record_depth(max_depth)
+    finally:
+        if stats is not None:
+            stats.stop()
+        if temporary_pool is not None:
+            temporary_pool.close()
+    
+    if tt is not None and pool is None:
+        logger.info(f"Tabela de transposição: {tt.hits} acertos, {tt.misses} falhas")
+    ordering = orderer.stats()
+    logger.info(f"Cortes: {ordering['cutoffs']}, na primeira jogada: "
+                f"{ordering['first_move_cutoff_rate']:.1%}")
+    if stats is not None:
+        logger.info(f"Estatísticas da busca: {stats.summary()}")
+    return best
+
+def computer_move(board, max_depth, num_workers, tt=None, tt_bytes=DEFAULT_TT_BYTES, time_budget_ms=None,
+                  pool=None, orderer=None, stats=None, cancel=None, k=None, algorithm="minimax", playouts=None,
+                  strategy="alphabeta", solver_nodes=DEFAULT_SOLVER_NODES, use_tablebase=True):
+    """
+    Função para calcular a jogada do computador usando minimax com paralelização.
+    Recebe o tabuleiro em lista de listas e o converte para Bitboard antes da busca.
+    Jogadas equivalentes por rotação/reflexão da posição são avaliadas uma única vez.
+    A tabela de transposição ``tt`` é usada na busca serial e pode ser mantida pelo
+    chamador entre as jogadas; na busca paralela cada worker usa a sua própria
+    tabela, com ``tt_bytes`` de memória.
+    Com ``time_budget_ms``, usa aprofundamento iterativo limitado por tempo (e
+    max_depth como profundidade máxima) em vez da profundidade fixa.
+    ``pool`` é um EnginePool mantido pelo chamador; sem ele, um pool temporário é
+    criado só para esta jogada. ``orderer`` é o MoveOrderer da busca serial (criado
+    para esta jogada se não for passado).
+    ``stats`` é um SearchStats preenchido com as estatísticas da busca, somando as
+    dos workers (com a divisão por worker em ``stats.workers``).
+    ``cancel`` (threading.Event) interrompe a busca, inclusive nos workers, com
+    SearchCancelled. ``k`` é o número de peças em linha para vencer (padrão: o tamanho).
+    ``algorithm`` escolhe entre o minimax ("minimax") e a busca Monte Carlo ("mcts",
+    engine.mcts), que usa ``time_budget_ms`` ou ``playouts`` simulações e ignora a
+    profundidade, a tabela e o ordenador.
+    ``strategy`` escolhe a janela do minimax (STRATEGIES): alfa-beta ("alphabeta"),
+    Principal Variation Search ("pvs") ou MTD(f) ("mtdf", sempre serial).
+    Antes da busca, o solucionador exato (engine.solver) tenta provar a posição em
+    até ``solver_nodes`` nós (0 desliga); se provar vitória ou empate, a jogada da
+    prova é usada sem busca. Ele só é tentado com k igual ao tamanho e até
+    SOLVER_MAX_EMPTY casas vazias, e respeita ``time_budget_ms`` e ``cancel``.
+    No 4x4 clássico, com ``use_tablebase``, a jogada vem da tablebase de
+    engine.tablebase quando o arquivo dela existe (``python -m engine.tablebase``).
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconhecido: {algorithm!r}")
+    try:
+        logger.info("Calculando jogada do computador")
+        board = Bitboard.from_rows(board, k)
+        if algorithm == "mcts":
+            from engine.mcts import mcts_move  # engine.mcts importa este módulo
+            best = mcts_move(board, time_budget_ms, playouts, num_workers, pool, stats, cancel)
+        else:
+            best = choose_move(board, max_depth, num_workers, tt, tt_bytes, time_budget_ms, pool, orderer, stats,
+                               cancel, strategy, solver_nodes, use_tablebase)
+        if best is None:
+            return None
+        
+        row, col = board.coords(best[0])
+        logger.info(f"Melhor jogada encontrada: ({row}, {col}) com score {best[1]}")
+        return row, col
+        
+    except SearchCancelled:
+        logger.info("Busca do computador cancelada")
+        raise
+    except Exception as e:
+        logger.error(f"Erro em computer_move: {e}")
+        raise
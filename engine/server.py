@@ -0,0 +1,326 @@
+"""
+Servidor local do motor: muitas partidas simultâneas atendidas por um único pool de processos.
+
+Uso: ``python -m engine.server [--host 127.0.0.1 --port 8765 | --unix /tmp/engine.sock] [--workers N]``.
+
+O protocolo é JSON Lines sobre TCP ou socket Unix. Cada pedido é um objeto com
+"id" (devolvido na resposta), "position" (formato texto de engine.batch) e,
+opcionalmente, "side", "k", "depth", "time_ms", "algorithm" e "playouts". A
+resposta traz "id", "best_move", "score", "nodes", "stats" e "time_ms", ou
+"id" e "error". As respostas de um cliente podem chegar fora da ordem dos pedidos.
+Uma linha maior que o limite do StreamReader (64 KiB) recebe um erro e a conexão
+é fechada.
+
+Os pedidos de todos os clientes esperam em filas por cliente, atendidas em
+rodízio (um pedido de cada cliente por vez) à medida que os workers ficam livres.
+A soma das filas é limitada a ``max_queue`` pedidos (acima disso o pedido é
+recusado com "server busy"), e cada cliente tem no máximo ``max_per_client``
+buscas em andamento. "depth", "time_ms" e "playouts" acima dos máximos do
+servidor (``max_depth``, ``max_time_ms`` e ``max_playouts``) são recusados, para
+que um pedido não prenda um worker indefinidamente; sem "time_ms", a busca
+ainda para em ``max_time_ms``.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import logging
+import multiprocessing
+import socket
+import sys
+
+from engine.batch import analyze_position, parse_position
+from engine.bitboard import O, X
+from engine.ordering import MoveOrderer
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 256
+DEFAULT_MAX_PER_CLIENT = 2
+# Limites de cada pedido
+DEFAULT_MAX_DEPTH = 16
+DEFAULT_MAX_TIME_MS = 60000
+DEFAULT_MAX_PLAYOUTS = 1000000
+
+# Estado de cada processo worker (criado em _init_server_worker): uma tabela de
+# transposição e um ordenador por regra (tamanho, k), reaproveitados entre os pedidos
+_worker_tt_bytes = DEFAULT_TT_BYTES
+_worker_tables = {}
+
+
+def _init_server_worker(tt_bytes):
+    global _worker_tt_bytes
+    _worker_tt_bytes = tt_bytes
+
+
+def _search(position, k, depth, time_budget_ms, algorithm, playouts):
+    """Executa um pedido em um processo worker."""
+    rules = (position[0], k or position[0])
+    if rules not in _worker_tables:
+        _worker_tables[rules] = (TranspositionTable(_worker_tt_bytes), MoveOrderer())
+    tt, orderer = _worker_tables[rules]
+    return analyze_position(position, depth, time_budget_ms, tt, orderer, True, algorithm, playouts, k)
+
+
+def parse_request(request, max_depth=DEFAULT_MAX_DEPTH, max_time_ms=DEFAULT_MAX_TIME_MS,
+                  max_playouts=DEFAULT_MAX_PLAYOUTS):
+    """
+    Valida um pedido e retorna os argumentos de _search; lança ValueError se for
+    inválido ou se "depth", "time_ms" ou "playouts" passarem dos máximos. Sem
+    "time_ms", a busca recebe ``max_time_ms`` como limite de tempo.
+    """
+    if not isinstance(request, dict) or "position" not in request:
+        raise ValueError("request must be an object with a 'position'")
+    size, x, o, side = parse_position(str(request["position"]))
+    if "side" in request:
+        side = str(request["side"]).upper()
+        if side not in (X, O):
+            raise ValueError(f"invalid side to move {request['side']!r}")
+    algorithm = request.get("algorithm", "minimax")
+    if algorithm not in ("minimax", "mcts"):
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    depth, time_ms, playouts = request.get("depth"), request.get("time_ms"), request.get("playouts")
+    for name, value in (("depth", depth), ("time_ms", time_ms), ("playouts", playouts), ("k", request.get("k"))):
+        if value is not None and (type(value) is not int or value < 1):  # bool é subclasse de int
+            raise ValueError(f"'{name}' must be a positive integer")
+    for name, value, limit in (("depth", depth, max_depth), ("time_ms", time_ms, max_time_ms),
+                               ("playouts", playouts, max_playouts)):
+        if value is not None and value > limit:
+            raise ValueError(f"'{name}' must be at most {limit}")
+    if depth is None and time_ms is None and not (algorithm == "mcts" and playouts is not None):
+        raise ValueError("either 'depth' or 'time_ms' must be given")
+    # Pedidos só com profundidade ou simulações também terminam no tempo máximo
+    time_ms = max_time_ms if time_ms is None else time_ms
+    return (size, x, o, side), request.get("k"), depth, time_ms, algorithm, playouts
+
+
+class _Client:
+    """Conexão de um cliente: fila de pedidos e buscas em andamento."""
+
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.queue = collections.deque()
+        self.running = 0
+        self.closed = False
+
+    def send(self, response):
+        if not self.closed:
+            self.writer.write((json.dumps(response) + "\n").encode())
+
+
+class EngineServer:
+    """
+    Servidor asyncio do motor. ``start`` abre o socket (TCP ou Unix) e o pool de
+    ``num_workers`` processos; ``close`` encerra ambos.
+    """
+
+    def __init__(self, num_workers=None, max_queue=DEFAULT_MAX_QUEUE, max_per_client=DEFAULT_MAX_PER_CLIENT,
+                 tt_bytes=DEFAULT_TT_BYTES, max_depth=DEFAULT_MAX_DEPTH, max_time_ms=DEFAULT_MAX_TIME_MS,
+                 max_playouts=DEFAULT_MAX_PLAYOUTS):
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self.tt_bytes = tt_bytes
+        self.limits = (max_depth, max_time_ms, max_playouts)
+        self.clients = collections.deque()  # ordem do rodízio
+        self.handlers = set()  # tarefas de handle_client, esperadas em close
+        self.queued = 0
+        self.running = 0
+        self.executor = None
+        self.server = None
+        self.next_client = 0
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        # Com "fork", os workers herdariam os sockets dos clientes e um cliente
+        # desconectado só seria percebido quando todos os workers os fechassem
+        self.executor = concurrent.futures.ProcessPoolExecutor(self.num_workers,
+                                                               multiprocessing.get_context("spawn"),
+                                                               _init_server_worker, (self.tt_bytes,))
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        addresses = ", ".join(str(sock.getsockname()) for sock in self.server.sockets)
+        logger.info(f"Servidor do motor em {addresses} com {self.num_workers} workers")
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Fecha as conexões abertas e espera cada handle_client terminar
+            for client in list(self.clients):
+                client.writer.close()
+            await asyncio.gather(*self.handlers, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def handle_client(self, reader, writer):
+        """Lê os pedidos de uma conexão até ela ser fechada."""
+        self.next_client += 1
+        client = _Client(self.next_client, writer)
+        self.clients.append(client)
+        self.handlers.add(asyncio.current_task())
+        logger.info(f"Cliente {client.name} conectado")
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # linha maior que o limite do StreamReader
+                    client.send({"id": None, "error": "request line too long"})
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    args = parse_request(request, *self.limits)
+                except ValueError as e:  # inclui json.JSONDecodeError
+                    client.send({"id": request_id, "error": str(e)})
+                    continue
+                if self.queued >= self.max_queue:
+                    client.send({"id": request_id, "error": "server busy"})
+                    continue
+                client.queue.append((request_id, args))
+                self.queued += 1
+                self.dispatch()
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Pedidos ainda na fila são descartados; os em andamento terminam e são ignorados
+            client.closed = True
+            self.queued -= len(client.queue)
+            client.queue.clear()
+            self.clients.remove(client)
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+            logger.info(f"Cliente {client.name} desconectado")
+
+    def dispatch(self):
+        """Envia pedidos aos workers livres, um por cliente em rodízio."""
+        loop = asyncio.get_running_loop()
+        while self.running < self.num_workers:
+            for _ in range(len(self.clients)):
+                client = self.clients[0]
+                self.clients.rotate(-1)
+                if client.queue and client.running < self.max_per_client:
+                    break
+            else:
+                return  # nenhum cliente com pedido que possa rodar agora
+            request_id, args = client.queue.popleft()
+            self.queued -= 1
+            self.running += 1
+            client.running += 1
+            future = loop.run_in_executor(self.executor, _search, *args)
+            future.add_done_callback(lambda f, c=client, i=request_id: self._finished(f, c, i))
+
+    def _finished(self, future, client, request_id):
+        self.running -= 1
+        client.running -= 1
+        try:
+            response = {"id": request_id}
+            response.update(future.result())
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        client.send(response)
+        if self.executor is not None:
+            self.dispatch()
+
+
+class EngineClient:
+    """
+    Cliente síncrono do servidor (um pedido por vez), usado por JogoDaVelha.
+    ``address`` é "host:porta" ou o caminho de um socket Unix.
+    """
+
+    def __init__(self, address, timeout=None):
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            self.sock = socket.create_connection((host, int(port)), timeout)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(address)
+        self.stream = self.sock.makefile("rb")
+        self.next_id = 0
+
+    def request(self, **fields):
+        """Envia um pedido e espera a resposta; lança RuntimeError se o servidor devolver um erro."""
+        self.next_id += 1
+        fields["id"] = self.next_id
+        self.sock.sendall((json.dumps(fields) + "\n").encode())
+        while True:
+            line = self.stream.readline()
+            if not line:
+                raise ConnectionError("engine server closed the connection")
+            response = json.loads(line)
+            if response.get("id") == self.next_id:
+                break
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def computer_move(self, rows, max_depth=None, time_budget_ms=None, k=None, algorithm="minimax"):
+        """Como engine.search.computer_move: recebe o tabuleiro em lista de listas e retorna (row, col) ou None."""
+        position = "".join(cell if cell != " " else "." for row in rows for cell in row)
+        response = self.request(position=position, side=O, k=k, algorithm=algorithm, depth=max_depth,
+                                time_ms=time_budget_ms)
+        move = response.get("best_move")
+        return tuple(move) if move is not None else None
+
+    def close(self):
+        """Fecha a conexão; um pedido esperando em outra thread termina com ConnectionError."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # já desconectado
+        self.stream.close()
+        self.sock.close()
+
+
+async def _serve(args):
+    server = EngineServer(args.workers, args.max_queue, args.max_per_client, args.tt_mb * 1024 * 1024,
+                          args.max_depth, args.max_time_ms, args.max_playouts)
+    await server.start(args.host, args.port, args.unix)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve engine searches to many games over a local socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE, help="queued requests across clients")
+    parser.add_argument("--max-per-client", type=int, default=DEFAULT_MAX_PER_CLIENT,
+                        help="concurrent searches per client")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, help="largest depth accepted")
+    parser.add_argument("--max-time-ms", type=int, default=DEFAULT_MAX_TIME_MS, help="largest time_ms accepted")
+    parser.add_argument("--max-playouts", type=int, default=DEFAULT_MAX_PLAYOUTS, help="largest playouts accepted")
+    parser.add_argument("--tt-mb", type=int, default=DEFAULT_TT_BYTES // (1024 * 1024),
+                        help="transposition table size per worker and rule set, in MB")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
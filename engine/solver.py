@@ -0,0 +1,192 @@
+"""
+Solucionador exato por proof-number search (PNS).
+
+Prova se o jogador da vez vence, empata ou perde com jogo perfeito, sem
+heurística. A árvore é E/OU: nos nós do atacante basta uma jogada que prove o
+objetivo, nos do defensor todas precisam provar. Cada nó guarda o número de
+prova (quantas folhas ainda precisam ser provadas para provar o nó) e o de
+refutação, e cada iteração expande o nó mais promissor, onde os dois números
+se encontram.
+
+As jogadas seguem o espaço de ameaças: quem pode completar uma linha só
+considera essa jogada, quem precisa bloquear uma linha do adversário só
+considera os bloqueios, e uma posição em que o lado que precisa vencer não tem
+mais nenhuma linha livre é refutada sem ser expandida. Fora isso, todas as casas
+vazias são consideradas, então as provas valem para qualquer jogada do adversário.
+
+``solve`` primeiro tenta provar a vitória; se ela for refutada, tenta provar que
+o jogador não perde (empate). As duas buscas dividem o limite de ``max_nodes``
+nós; se ele acabar antes, ou se o ``deadline`` passar ou ``cancel`` for ativado,
+o resultado fica em aberto.
+"""
+
+import time
+
+from engine.bitboard import O, X, iter_bits
+from engine.ordering import threat_cells
+
+# Nós criados por padrão antes de desistir (somando as duas buscas; uns 50 ms)
+DEFAULT_SOLVER_NODES = 5000
+
+# Casas vazias acima das quais choose_move nem tenta o solucionador: com mais
+# casas, a prova quase nunca cabe no limite de nós e a tentativa é só custo
+SOLVER_MAX_EMPTY = 12
+
+WIN = "win"
+DRAW = "draw"
+LOSS = "loss"
+
+# Número de prova de um nó refutado (e de refutação de um nó provado)
+INFINITY = 1 << 40
+
+
+class ProofNode:
+    """Nó da árvore de prova: ``move`` foi jogada para chegar aqui e ``player`` joga a seguir."""
+
+    __slots__ = ("move", "player", "parent", "children", "proof", "disproof")
+
+    def __init__(self, move, player, parent):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.proof = 1
+        self.disproof = 1
+
+
+def can_win(board, player):
+    """Verifica se ainda há alguma linha sem peças do adversário de ``player``."""
+    return 0 in (board.o_counts if player == X else board.x_counts)
+
+
+def outcome(board, attacker, draw_ok):
+    """
+    Resultado conhecido da posição para o objetivo do atacante: True (provado),
+    False (refutado) ou None (em aberto). Com ``draw_ok``, o empate também prova.
+    """
+    defender = O if attacker == X else X
+    if board.has_won(attacker):
+        return True
+    if board.has_won(defender):
+        return False
+    if board.is_full():
+        return draw_ok
+    if draw_ok:
+        return True if not can_win(board, defender) else None
+    return False if not can_win(board, attacker) else None
+
+
+def threat_moves(board, player):
+    """Jogadas de ``player``: uma vitória imediata, senão os bloqueios obrigatórios, senão todas as casas vazias."""
+    wins = threat_cells(board, player)
+    if wins:
+        return [(wins & -wins).bit_length() - 1]
+    blocks = threat_cells(board, O if player == X else X)
+    return list(iter_bits(blocks or board.empty_mask()))
+
+
+def proof_search(board, player, attacker, draw_ok, max_nodes, solved=None, deadline=None, cancel=None):
+    """
+    Busca de números de prova a partir de ``board`` com ``player`` a jogar. Retorna
+    (raiz, nós criados); a raiz está provada se ``proof`` for 0 e refutada se
+    ``disproof`` for 0. ``solved`` guarda {(x, o): bool} das posições já resolvidas,
+    compartilhado entre as transposições. A busca para (com a raiz em aberto) no
+    ``deadline`` (time.monotonic) ou quando ``cancel`` é ativado. O tabuleiro volta
+    ao estado original.
+    """
+    if solved is None:
+        solved = {}
+    root = ProofNode(None, player, None)
+    known = outcome(board, attacker, draw_ok)
+    if known is not None:
+        root.proof, root.disproof = (0, INFINITY) if known else (INFINITY, 0)
+        return root, 1
+
+    nodes = 1
+    while root.proof and root.disproof and nodes < max_nodes:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if cancel is not None and cancel.is_set():
+            break
+        # Seleção: desce pelo filho com o menor número de prova (atacante) ou de refutação (defensor)
+        node = root
+        while node.children:
+            if node.player == attacker:
+                child = min(node.children, key=lambda c: c.proof)
+            else:
+                child = min(node.children, key=lambda c: c.disproof)
+            board.play(child.move, node.player)
+            node = child
+
+        # Expansão
+        next_player = O if node.player == X else X
+        for index in threat_moves(board, node.player):
+            board.play(index, node.player)
+            child = ProofNode(index, next_player, node)
+            known = solved.get((board.x, board.o))
+            if known is None:
+                known = outcome(board, attacker, draw_ok)
+            if known is not None:
+                child.proof, child.disproof = (0, INFINITY) if known else (INFINITY, 0)
+            board.undo(index, node.player)
+            node.children.append(child)
+            nodes += 1
+
+        # Atualização dos números até a raiz, desfazendo as jogadas do caminho
+        while node is not None:
+            if node.player == attacker:
+                node.proof = min(child.proof for child in node.children)
+                node.disproof = min(INFINITY, sum(child.disproof for child in node.children))
+            else:
+                node.proof = min(INFINITY, sum(child.proof for child in node.children))
+                node.disproof = min(child.disproof for child in node.children)
+            if not node.proof or not node.disproof:
+                solved[(board.x, board.o)] = not node.proof
+            if node.parent is not None:
+                board.undo(node.move, node.parent.player)
+            node = node.parent
+    return root, nodes
+
+
+def proof_length(node, attacker):
+    """Lances da prova encontrada a partir de um nó provado (até as folhas já resolvidas)."""
+    if not node.children:
+        return 0
+    if node.player == attacker:
+        return 1 + min(proof_length(child, attacker) for child in node.children if not child.proof)
+    return 1 + max(proof_length(child, attacker) for child in node.children)
+
+
+def proof_move(root, board):
+    """Jogada da raiz provada; None se a posição já terminou."""
+    for child in root.children:
+        if not child.proof:
+            return child.move
+    if board.x_lines or board.o_lines or board.is_full():
+        return None
+    # Provada sem expansão (o adversário não tem mais linhas livres): qualquer jogada mantém o resultado
+    return threat_moves(board, root.player)[0]
+
+
+def solve(board, player=O, max_nodes=DEFAULT_SOLVER_NODES, deadline=None, cancel=None):
+    """
+    Tenta resolver a posição com ``player`` a jogar. Retorna (resultado, jogada,
+    score, nós) com resultado WIN, DRAW ou LOSS, ou None se o limite de nós, o
+    ``deadline`` ou ``cancel`` interromperem a prova (com jogada e score None). A jogada é a da prova (None em LOSS e em posições
+    terminais); o score segue o minimax, do ponto de vista de ``player``: 1000
+    menos os lances da prova na vitória (a prova encontrada não é necessariamente
+    a mais curta), 0 no empate e -1000 na derrota.
+    """
+    root, nodes = proof_search(board, player, player, False, max_nodes, None, deadline, cancel)
+    if not root.proof:
+        return WIN, proof_move(root, board), 1000 - proof_length(root, player), nodes
+    if root.disproof:
+        return None, None, None, nodes
+
+    root, more = proof_search(board, player, player, True, max_nodes - nodes, None, deadline, cancel)
+    nodes += more
+    if not root.proof:
+        return DRAW, proof_move(root, board), 0, nodes
+    if not root.disproof:
+        return LOSS, None, -1000, nodes
+    return None, None, None, nodes
@@ -0,0 +1,61 @@
+"""
+Mede o custo de partida do motor: importação a frio e criação dos workers.
+
+Uso: ``python -m engine.startup [--workers N] [--start-method spawn]``.
+Termina com código 1 se a importação a frio passar de IMPORT_BUDGET_MS ou a
+criação do pool passar de SPAWN_BUDGET_MS.
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+
+# Orçamento de tempo para importar engine.search em um interpretador novo
+IMPORT_BUDGET_MS = 100
+# Orçamento de tempo para todos os workers de um pool ficarem prontos
+SPAWN_BUDGET_MS = 2000
+
+_IMPORT_PROBE = ("import time; started = time.perf_counter(); import engine.search; "
+                 "print((time.perf_counter() - started) * 1000)")
+
+
+def measure_import_ms(repeat=5):
+    """Retorna o menor tempo (ms) de importação de engine.search em interpretadores novos."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], check=True, cwd=root,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output))
+    return min(timings)
+
+
+def measure_spawn_ms(num_workers):
+    """Retorna o tempo (ms) até todos os workers de um EnginePool ficarem prontos."""
+    from engine.pool import EnginePool
+    pool = EnginePool(num_workers)
+    try:
+        return pool.spawn_seconds * 1000
+    finally:
+        pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure engine cold-start and worker spawn time.")
+    parser.add_argument("--workers", type=int, default=min(4, multiprocessing.cpu_count()))
+    parser.add_argument("--start-method", default="spawn", choices=multiprocessing.get_all_start_methods())
+    args = parser.parse_args(argv)
+    multiprocessing.set_start_method(args.start_method)
+
+    import_ms = measure_import_ms()
+    spawn_ms = measure_spawn_ms(args.workers)
+    print(f"engine import: {import_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"worker spawn ({args.workers} workers, {args.start_method}): {spawn_ms:.1f} ms "
+          f"(budget {SPAWN_BUDGET_MS} ms)")
+    return 0 if import_ms <= IMPORT_BUDGET_MS and spawn_ms <= SPAWN_BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
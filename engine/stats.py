@@ -0,0 +1,96 @@
+"""
+Estatísticas da busca: nós, folhas, posições terminais, cortes, uso da tabela
+de transposição e tempo por profundidade, com a divisão por worker na busca
+paralela.
+
+As funções de busca recebem um SearchStats opcional (``stats``); sem ele, o
+único custo é um teste ``stats is not None`` por nó.
+"""
+
+import json
+import time
+
+# Contadores somados entre a busca principal e os workers
+COUNTERS = ("nodes", "leaves", "terminals", "cutoffs", "tt_probes", "tt_hits", "tt_cutoffs", "splits")
+
+
+class SearchStats:
+    """
+    Contadores de uma busca. ``nodes`` conta as chamadas do minimax (incluindo
+    folhas e posições terminais) e os nós divididos do pv_split; ``leaves`` são as
+    avaliações heurísticas no limite de profundidade; ``terminals`` as posições
+    com vitória ou empate; ``cutoffs`` os cortes beta; ``tt_hits`` as consultas à
+    tabela que encontraram a posição e ``tt_cutoffs`` as que encerraram o nó.
+    """
+
+    def __init__(self):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        # Uma entrada por profundidade completada: {"depth", "time_ms", "nodes"}
+        self.depths = []
+        # pid do worker -> contadores das tarefas que ele executou
+        self.workers = {}
+        self.elapsed = 0.0
+        self._started = None
+        self._mark_time = None
+        self._mark_nodes = 0
+
+    def count_node(self, board, depth, max_depth):
+        """Conta um nó do minimax e classifica-o como terminal ou folha."""
+        self.nodes += 1
+        if board.x_lines or board.o_lines or board.is_full():
+            self.terminals += 1
+        elif depth >= max_depth:
+            self.leaves += 1
+
+    def start(self):
+        self._started = self._mark_time = time.perf_counter()
+        self._mark_nodes = self.nodes
+
+    def stop(self):
+        if self._started is not None:
+            self.elapsed += time.perf_counter() - self._started
+            self._started = None
+
+    def record_depth(self, depth):
+        """Registra o tempo e os nós gastos desde a profundidade anterior (ou do início)."""
+        now = time.perf_counter()
+        self.depths.append({"depth": depth, "time_ms": round((now - self._mark_time) * 1000, 3),
+                            "nodes": self.nodes - self._mark_nodes})
+        self._mark_time = now
+        self._mark_nodes = self.nodes
+
+    def counters(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def merge(self, counters, worker=None):
+        """Soma os contadores de outra busca (de um worker, identificado por ``worker``)."""
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + counters[name])
+        if worker is not None:
+            totals = self.workers.setdefault(str(worker), dict.fromkeys(COUNTERS, 0))
+            for name in COUNTERS:
+                totals[name] += counters[name]
+
+    @property
+    def nps(self):
+        """Nós por segundo (0 se o tempo ainda não foi medido)."""
+        return self.nodes / self.elapsed if self.elapsed else 0
+
+    def to_dict(self):
+        result = self.counters()
+        result.update(time_ms=round(self.elapsed * 1000, 3), nps=round(self.nps),
+                      tt_hit_rate=round(self.tt_hits / self.tt_probes, 4) if self.tt_probes else 0,
+                      depths=list(self.depths), workers=dict(self.workers))
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def summary(self):
+        """Resumo de uma linha para o log."""
+        return (f"{self.nodes} nós em {self.elapsed * 1000:.0f} ms ({self.nps:.0f} nós/s), "
+                f"{self.leaves} folhas, {self.terminals} terminais, {self.cutoffs} cortes, "
+                f"{self.tt_hits}/{self.tt_probes} acertos na tabela"
+                + (f", {len(self.workers)} workers" if self.workers else ""))
+
@@ -0,0 +1,77 @@
+"""
+Simetrias do tabuleiro quadrado (grupo diedral de 8 rotações e reflexões).
+
+Toda posição do jogo da velha tem o mesmo valor que as suas 7 imagens por
+rotação/reflexão, já que as linhas vencedoras (de qualquer k) são levadas umas
+nas outras. Este módulo agrupa as jogadas da raiz que são equivalentes, para que
+cada grupo seja avaliado só uma vez.
+"""
+
+from engine.bitboard import iter_bits
+
+# Cache das permutações de casas por tamanho de tabuleiro
+_PERMUTATIONS = {}
+
+
+def symmetry_permutations(size):
+    """
+    Retorna as 8 permutações do tabuleiro; ``perm[i]`` é a casa para onde a casa ``i`` vai.
+    A primeira permutação é sempre a identidade.
+    """
+    perms = _PERMUTATIONS.get(size)
+    if perms is None:
+        n = size - 1
+        transforms = (
+            lambda r, c: (r, c),          # identidade
+            lambda r, c: (c, n - r),      # rotação de 90 graus
+            lambda r, c: (n - r, n - c),  # rotação de 180 graus
+            lambda r, c: (n - c, r),      # rotação de 270 graus
+            lambda r, c: (r, n - c),      # reflexão horizontal
+            lambda r, c: (n - r, c),      # reflexão vertical
+            lambda r, c: (c, r),          # diagonal principal
+            lambda r, c: (n - c, n - r),  # diagonal secundária
+        )
+        perms = []
+        for transform in transforms:
+            perm = []
+            for index in range(size * size):
+                row, col = transform(*divmod(index, size))
+                perm.append(row * size + col)
+            perms.append(tuple(perm))
+        perms = _PERMUTATIONS[size] = tuple(perms)
+    return perms
+
+
+def transform_mask(mask, perm):
+    """Aplica uma permutação de casas a uma máscara de bits."""
+    result = 0
+    for index in iter_bits(mask):
+        result |= 1 << perm[index]
+    return result
+
+
+def stabilizer(board):
+    """Retorna as permutações que deixam a posição inalterada (sempre inclui a identidade)."""
+    return [perm for perm in symmetry_permutations(board.size)
+            if transform_mask(board.x, perm) == board.x and transform_mask(board.o, perm) == board.o]
+
+
+def unique_moves(board):
+    """
+    Agrupa as casas vazias em classes de jogadas equivalentes pela simetria da posição.
+
+    Retorna uma lista de (representante, casas_equivalentes), em ordem crescente
+    do representante. Basta avaliar o representante: todas as casas da classe têm
+    a mesma pontuação.
+    """
+    perms = stabilizer(board)
+    seen = 0
+    groups = []
+    for index in iter_bits(board.empty_mask()):
+        if seen >> index & 1:
+            continue
+        orbit = sorted({perm[index] for perm in perms})
+        for other in orbit:
+            seen |= 1 << other
+        groups.append((index, orbit))
+    return groups
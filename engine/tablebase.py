@@ -0,0 +1,345 @@
+"""
+Tablebase do 4x4 clássico: valor exato e distância até o fim de todas as posições.
+
+Uso: ``python -m engine.tablebase [--output engine/tablebase4x4.bin] [--processes N]``.
+
+O arquivo é um array denso de um byte por posição, sem chaves: cada posição
+válida tem um índice próprio (ranking perfeito), então consultar uma posição é
+calcular o índice e ler um byte do arquivo mapeado com ``mmap``, sem carregar
+nada na memória. As posições são ordenadas pelo número de peças n (o primeiro
+jogador tem n - n // 2 peças e o segundo n // 2); dentro do nível, pelo
+ranking colex das casas ocupadas (16 escolhe n) e depois pelo ranking colex de
+quais dessas casas são do segundo jogador (n escolhe n // 2). São 10.165.779
+posições, uns 10 MB.
+
+Cada byte guarda ``distância << 2 | valor``, do ponto de vista de quem joga:
+DRAW_ENTRY (0), WIN_ENTRY (1) ou LOSS_ENTRY (2), e a distância é o número de
+lances até o fim da partida com jogo perfeito (o vencedor busca a vitória mais
+curta e o perdedor resiste o máximo). INVALID_ENTRY marca as posições em que
+quem joga já completou uma linha, que não acontecem em uma partida. Como as
+cores não importam para as regras, a mesma tabela serve para X e para O.
+
+A construção é retrógrada: as posições com 16 peças são terminais, e o nível
+n depende só do nível n + 1, então os níveis são calculados do 16 até o 0. Cada
+nível é dividido em blocos calculados em paralelo por um multiprocessing.Pool;
+os workers leem o nível seguinte direto do arquivo em construção, mapeado com
+``mmap``, e devolvem os bytes do seu bloco. A construção usa NumPy (cada bloco
+é calculado sem laços em Python por posição); a consulta não precisa dele.
+"""
+
+import argparse
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+
+from engine.bitboard import O, iter_bits, line_masks
+from engine.solver import DRAW, LOSS, WIN
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (só a construção precisa dele)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+SIZE = 4
+CELLS = SIZE * SIZE
+
+DEFAULT_TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase4x4.bin")
+
+# Cabeçalho do arquivo: assinatura, tamanho, k e versão do formato
+HEADER = b"PGTB" + bytes((SIZE, SIZE, 1, 0))
+
+DRAW_ENTRY, WIN_ENTRY, LOSS_ENTRY = 0, 1, 2
+INVALID_ENTRY = 0xFF
+_RESULTS = {DRAW_ENTRY: DRAW, WIN_ENTRY: WIN, LOSS_ENTRY: LOSS}
+
+# Posições por número de peças e índice da primeira posição de cada nível
+LEVEL_SIZES = [math.comb(CELLS, n) * math.comb(n, n // 2) for n in range(CELLS + 1)]
+LEVEL_OFFSETS = [sum(LEVEL_SIZES[:n]) for n in range(CELLS + 1)]
+TOTAL_POSITIONS = sum(LEVEL_SIZES)
+
+# Posições calculadas por tarefa dos workers na construção
+DEFAULT_CHUNK = 1 << 16
+
+
+def colex_rank(mask):
+    """Posição de ``mask`` entre as máscaras com o mesmo número de bits, em ordem crescente."""
+    rank = count = 0
+    for index in iter_bits(mask):
+        count += 1
+        rank += math.comb(index, count)
+    return rank
+
+
+def compress(mask, occupied):
+    """Junta os bits de ``mask`` nas casas de ``occupied``, na ordem das casas."""
+    result = 0
+    for bit, index in enumerate(iter_bits(occupied)):
+        if mask >> index & 1:
+            result |= 1 << bit
+    return result
+
+
+def position_index(mover, other):
+    """
+    Índice da posição com as peças ``mover`` do jogador da vez e ``other`` do
+    adversário, ou None se as contagens não forem de uma partida (quem joga tem o
+    mesmo número de peças do adversário ou uma a menos).
+    """
+    if mover.bit_count() == other.bit_count():
+        second = other
+    elif mover.bit_count() + 1 == other.bit_count():
+        second = mover
+    else:
+        return None
+    occupied = mover | other
+    n = occupied.bit_count()
+    return (LEVEL_OFFSETS[n] + colex_rank(occupied) * math.comb(n, n // 2)
+            + colex_rank(compress(second, occupied)))
+
+
+class Tablebase:
+    """Tablebase aberta com ``mmap`` (somente leitura); lança ValueError se o arquivo não for uma tablebase 4x4."""
+
+    def __init__(self, path=DEFAULT_TABLEBASE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) != len(HEADER) + TOTAL_POSITIONS or self.data[:len(HEADER)] != HEADER:
+            self.data.close()
+            raise ValueError(f"{path} is not a {SIZE}x{SIZE} tablebase")
+
+    def probe(self, mover, other):
+        """Retorna (resultado, distância) para quem joga (WIN, DRAW ou LOSS), ou None para posições fora da tabela."""
+        index = position_index(mover, other)
+        if index is None:
+            return None
+        entry = self.data[len(HEADER) + index]
+        if entry == INVALID_ENTRY:
+            return None
+        return _RESULTS[entry & 3], entry >> 2
+
+    def best_move(self, board, player=O):
+        """
+        Jogada perfeita de ``player`` em um Bitboard 4x4 clássico; retorna (índice,
+        score) como choose_move, ou None se a posição não estiver na tabela ou já
+        tiver terminado. O score segue o do solucionador: 1000 menos os lances até a
+        vitória, 0 no empate e o negativo disso na derrota.
+        """
+        if board.size != SIZE or board.k != SIZE:
+            return None
+        mover, other = (board.o, board.x) if player == O else (board.x, board.o)
+        root = self.probe(mover, other)
+        if root is None or root[1] == 0:
+            return None
+        best = best_key = None
+        for index in iter_bits(board.empty_mask()):
+            result, distance = self.probe(other, mover | 1 << index)
+            # Vitória mais curta, senão empate, senão a derrota mais longa
+            if result == LOSS:
+                key = (2, -distance)
+            elif result == DRAW:
+                key = (1, 0)
+            else:
+                key = (0, distance)
+            if best_key is None or key > best_key:
+                best, best_key = index, key
+        if best_key[0] == 1:
+            return best, 0
+        score = 1000 - (abs(best_key[1]) + 1)
+        return best, score if best_key[0] == 2 else -score
+
+    def close(self):
+        self.data.close()
+
+
+# Tablebases já abertas por caminho (None quando o arquivo não existe ou não pôde ser aberto)
+_OPEN_TABLEBASES = {}
+
+
+def load_tablebase(path=DEFAULT_TABLEBASE_PATH):
+    """
+    Abre a tablebase uma única vez por processo; retorna None se o arquivo não
+    existir ou estiver truncado, corrompido ou em outro formato (com um aviso no
+    log, uma só vez), e o motor volta à busca.
+    """
+    if path not in _OPEN_TABLEBASES:
+        try:
+            _OPEN_TABLEBASES[path] = Tablebase(path)
+            logger.info(f"Tablebase 4x4 carregada de {path}")
+        except FileNotFoundError:
+            _OPEN_TABLEBASES[path] = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Tablebase 4x4 ignorada ({path}): {e}")
+            _OPEN_TABLEBASES[path] = None
+    return _OPEN_TABLEBASES[path]
+
+
+def probe_move(board, player=O, path=DEFAULT_TABLEBASE_PATH):
+    """Jogada perfeita (índice, score) pela tablebase, ou None se ela não existir ou não cobrir a posição."""
+    tablebase = load_tablebase(path)
+    return tablebase.best_move(board, player) if tablebase is not None else None
+
+
+# Tabelas da construção (criadas em cada worker): ranking colex e número de bits
+# de cada máscara de 16 bits, as máscaras agrupadas por número de bits e as linhas
+_build_tables = None
+# Arquivo em construção, mapeado somente para leitura em cada worker
+_worker_entries = None
+
+
+def _tables():
+    global _build_tables
+    if _build_tables is None:
+        masks = np.arange(1 << CELLS, dtype=np.int64)
+        popcount = np.zeros(1 << CELLS, dtype=np.int64)
+        for index in range(CELLS):
+            popcount += masks >> index & 1
+        rank = np.zeros(1 << CELLS, dtype=np.int64)
+        by_count = []
+        for count in range(CELLS + 1):
+            group = masks[popcount == count]
+            rank[group] = np.arange(len(group))
+            by_count.append(group)
+        lines = np.array(line_masks(SIZE), dtype=np.int64)
+        _build_tables = rank, popcount, by_count, lines
+    return _build_tables
+
+
+def _has_line(pieces, lines):
+    return ((pieces[:, None] & lines) == lines).any(axis=1)
+
+
+def _deposit(pattern, occupied):
+    """Inverso de compress: espalha os bits de ``pattern`` pelas casas de ``occupied``."""
+    result = np.zeros_like(occupied)
+    bit = np.zeros_like(occupied)
+    for index in range(CELLS):
+        present = occupied >> index & 1
+        result |= (pattern >> bit & present) << index
+        bit += present
+    return result
+
+
+def _init_build_worker(path):
+    global _worker_entries
+    _worker_entries = np.memmap(path, dtype=np.uint8, mode="r", offset=len(HEADER))
+
+
+def build_chunk(task):
+    """
+    Calcula as posições [start, stop) do nível n (com o nível n + 1 já no arquivo)
+    e retorna (start, bytes das entradas).
+    """
+    n, start, stop = task
+    rank, popcount, by_count, lines = _tables()
+    patterns = by_count[n // 2][by_count[n // 2] < 1 << n]  # casas do segundo jogador entre as n ocupadas
+    ranks = np.arange(start, stop, dtype=np.int64)
+    occupied = by_count[n][ranks // len(patterns)]
+    pattern = patterns[ranks % len(patterns)]
+    second = _deposit(pattern, occupied)
+    first = occupied ^ second
+    mover, other = (first, second) if n % 2 == 0 else (second, first)
+
+    entries = np.full(len(ranks), INVALID_ENTRY, dtype=np.uint8)
+    won = _has_line(mover, lines)
+    lost = _has_line(other, lines) & ~won
+    entries[lost] = LOSS_ENTRY
+    alive = ~won & ~lost
+    if n == CELLS:
+        entries[alive] = DRAW_ENTRY
+        return start, entries.tobytes()
+
+    # Só as posições em andamento olham os filhos, todos no nível n + 1
+    occupied, pattern = occupied[alive], pattern[alive]
+    child_base = LEVEL_OFFSETS[n + 1]
+    child_patterns = math.comb(n + 1, (n + 1) // 2)
+    placed = n % 2  # a peça nova é do segundo jogador quando n é ímpar
+    win_distance = np.full(len(occupied), INVALID_ENTRY, dtype=np.int64)
+    loss_distance = np.zeros(len(occupied), dtype=np.int64)
+    draw = np.zeros(len(occupied), dtype=bool)
+    for index in range(CELLS):
+        empty = np.nonzero((occupied >> index & 1) == 0)[0]
+        child_occupied = occupied[empty] | 1 << index
+        below = popcount[occupied[empty] & ((1 << index) - 1)]  # posição da casa nova entre as ocupadas
+        low = (1 << below) - 1
+        parent_pattern = pattern[empty]
+        child_pattern = (parent_pattern & low) | ((parent_pattern & ~low) << 1) | (placed << below)
+        child = _worker_entries[child_base + rank[child_occupied] * child_patterns + rank[child_pattern]]
+        value, distance = child & 3, (child >> 2).astype(np.int64)
+        win_distance[empty] = np.where(value == LOSS_ENTRY, np.minimum(win_distance[empty], distance),
+                                       win_distance[empty])
+        draw[empty] |= value == DRAW_ENTRY
+        loss_distance[empty] = np.maximum(loss_distance[empty], np.where(value == WIN_ENTRY, distance, 0))
+
+    # Vitória mais curta; senão empate (a partida vai até encher o tabuleiro); senão a derrota mais longa
+    result = np.where(win_distance != INVALID_ENTRY, (win_distance + 1) << 2 | WIN_ENTRY,
+                      np.where(draw, (CELLS - n) << 2 | DRAW_ENTRY, (loss_distance + 1) << 2 | LOSS_ENTRY))
+    entries[alive] = result
+    return start, entries.tobytes()
+
+
+def build(path=DEFAULT_TABLEBASE_PATH, processes=None, chunk=DEFAULT_CHUNK, log=None):
+    """
+    Constrói a tablebase em ``path`` com ``processes`` workers (padrão: um por
+    núcleo). O arquivo é escrito em ``path``.tmp e só substitui ``path`` no fim.
+    Retorna {resultado: número de posições}.
+    """
+    if np is None:
+        raise RuntimeError("building the tablebase requires NumPy")
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER)
+        f.truncate(len(HEADER) + TOTAL_POSITIONS)
+    with open(temporary, "r+b") as f:
+        data = mmap.mmap(f.fileno(), 0)
+    pool = multiprocessing.Pool(processes, initializer=_init_build_worker, initargs=(temporary,))
+    try:
+        for n in range(CELLS, -1, -1):
+            started = time.perf_counter()
+            tasks = [(n, start, min(start + chunk, LEVEL_SIZES[n])) for start in range(0, LEVEL_SIZES[n], chunk)]
+            for start, entries in pool.imap_unordered(build_chunk, tasks):
+                offset = len(HEADER) + LEVEL_OFFSETS[n] + start
+                data[offset:offset + len(entries)] = entries
+            if log is not None:
+                log(f"level {n:2}: {LEVEL_SIZES[n]} positions in {time.perf_counter() - started:.1f} s")
+        data.flush()
+        entries = np.frombuffer(data, dtype=np.uint8, offset=len(HEADER))
+        counts = {name: int(np.count_nonzero(entries & 3 == code)) for code, name in _RESULTS.items()}
+        counts["invalid"] = int(np.count_nonzero(entries == INVALID_ENTRY))
+        del entries
+    finally:
+        pool.terminate()
+        pool.join()
+        data.close()
+    os.replace(temporary, path)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the 4x4 endgame tablebase by retrograde analysis.")
+    parser.add_argument("--output", default=DEFAULT_TABLEBASE_PATH, help="tablebase file to write")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    try:
+        counts = build(args.output, args.processes, log=print)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"{TOTAL_POSITIONS} positions in {time.perf_counter() - started:.1f} s: "
+          + ", ".join(f"{count} {name}" for name, count in counts.items()))
+    tablebase = Tablebase(args.output)
+    result, distance = tablebase.probe(0, 0)
+    tablebase.close()
+    print(f"empty board: {result} in {distance} moves with perfect play")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Torneio de autojogo entre configurações do motor, sem interface gráfica.
+
+Uso: ``python -m engine.tournament --size 4 --config depth=4 --config depth=6 --config time_ms=200``.
+
+Cada configuração (``--config``) é uma lista ``chave=valor`` separada por
+vírgulas, com as chaves de CONFIG_KEYS: "name", "algorithm" (minimax ou mcts),
+"strategy" (alphabeta, pvs ou mtdf), "depth", "time_ms", "workers", "playouts",
+"solver_nodes" (limite do solucionador exato; 0 o desliga) e "tablebase" (1 liga a
+tablebase do 4x4, engine.tablebase; desligada por padrão, para que a
+profundidade e o tempo de cada configuração decidam a força). Todas as
+configurações se enfrentam (todos contra todos) a partir das mesmas aberturas, sorteadas com ``--seed``
+(``--opening-plies`` jogadas ao acaso) ou lidas de um livro (``--book``, uma
+posição por linha no formato texto de engine.batch). Cada abertura é jogada
+duas vezes por par, trocando as cores.
+
+As partidas rodam em paralelo em ``--parallel`` processos, cada uma com busca
+serial. Configurações com mais de um worker usam um EnginePool e exigem
+``--parallel 1`` (o padrão nesse caso), para que cada medida tenha os núcleos só para ela.
+
+O relatório traz, por configuração, vitórias/empates/derrotas, a pontuação
+(vitória 1, empate 0,5), a latência média e o p95 por jogada, os nós por jogada
+e o custo estimado em CPU por jogada (latência x workers). Com ``--target``,
+indica a configuração mais barata cuja pontuação alcança o alvo.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import statistics
+import sys
+import time
+
+from engine.batch import parse_position, position_board
+from engine.bitboard import O, X, Bitboard, iter_bits
+from engine.mcts import mcts_move
+from engine.ordering import MoveOrderer
+from engine.search import STRATEGIES, choose_move
+from engine.solver import DEFAULT_SOLVER_NODES
+from engine.stats import SearchStats
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
+
+# Chaves aceitas em --config e os seus tipos
+CONFIG_KEYS = {"name": str, "algorithm": str, "strategy": str, "depth": int, "time_ms": int, "workers": int,
+               "playouts": int, "solver_nodes": int, "tablebase": int}
+
+DEFAULT_OPENING_PLIES = 2
+
+
+def parse_config(text):
+    """Converte "depth=4,workers=2" no dicionário da configuração; lança ValueError se for inválida."""
+    config = {"name": text, "algorithm": "minimax", "strategy": "alphabeta", "depth": None, "time_ms": None,
+              "workers": 1, "playouts": None, "solver_nodes": DEFAULT_SOLVER_NODES, "tablebase": 0}
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in CONFIG_KEYS or not value:
+            raise ValueError(f"invalid config item {item!r}: expected one of {', '.join(CONFIG_KEYS)} with a value")
+        try:
+            config[key] = CONFIG_KEYS[key](value.strip())
+        except ValueError:
+            raise ValueError(f"invalid value for {key!r}: {value!r}") from None
+    if config["algorithm"] not in ("minimax", "mcts"):
+        raise ValueError(f"unknown algorithm {config['algorithm']!r}")
+    if config["strategy"] not in STRATEGIES:
+        raise ValueError(f"unknown strategy {config['strategy']!r}")
+    if config["algorithm"] == "minimax" and config["depth"] is None and config["time_ms"] is None:
+        raise ValueError(f"config {text!r} needs depth or time_ms")
+    if config["workers"] < 1:
+        raise ValueError(f"config {text!r} needs at least one worker")
+    return config
+
+
+def random_openings(size, k, count, plies, seed):
+    """Sorteia ``count`` aberturas distintas (x, o) de ``plies`` jogadas que ainda não terminaram."""
+    rng = random.Random(seed)
+    openings = []
+    attempts = 0
+    while len(openings) < count and attempts < count * 100:
+        attempts += 1
+        board = Bitboard(size, k=k)
+        player = X
+        for _ in range(plies):
+            moves = list(iter_bits(board.empty_mask()))
+            board.play(moves[rng.randrange(len(moves))], player)
+            player = O if player == X else X
+        if not (board.x_lines or board.o_lines or board.is_full()) and (board.x, board.o) not in openings:
+            openings.append((board.x, board.o))
+    return openings
+
+
+def book_openings(path, size):
+    """Lê as aberturas (x, o) de um arquivo no formato texto de engine.batch."""
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                book_size, x, o, _ = parse_position(line)
+                if book_size != size:
+                    raise ValueError(f"book position {line!r} is not {size}x{size}")
+                openings.append((x, o))
+    return openings
+
+
+def engine_move(config, board, side, tables, pool=None):
+    """Retorna (índice, segundos, nós) da jogada de ``config`` com ``side`` a jogar em ``board``."""
+    searched = position_board(board.size, board.x, board.o, side, board.k)
+    stats = SearchStats()
+    started = time.perf_counter()
+    if config["algorithm"] == "mcts":
+        best = mcts_move(searched, config["time_ms"], config["playouts"], config["workers"], pool, stats)
+    else:
+        tt, orderer = tables
+        best = choose_move(searched, config["depth"], config["workers"], tt, time_budget_ms=config["time_ms"],
+                           pool=pool, orderer=orderer, stats=stats, strategy=config["strategy"],
+                           solver_nodes=config["solver_nodes"], use_tablebase=bool(config["tablebase"]))
+    return best[0], time.perf_counter() - started, stats.nodes
+
+
+def play_game(task, pools=None):
+    """
+    Joga uma partida (size, k, abertura, config de X, config de O, tt_bytes) e
+    retorna o vencedor ("X", "O" ou None) e as latências e nós de cada lado.
+    ``pools`` mapeia o número de workers para um EnginePool (só na execução serial).
+    """
+    size, k, (x, o), configs, tt_bytes = task
+    board = Bitboard(size, x, o, k)
+    side = X if x.bit_count() == o.bit_count() else O
+    # Cada lado mantém a sua tabela e o seu ordenador durante a partida, como no jogo
+    tables = {player: (TranspositionTable(tt_bytes), MoveOrderer()) for player in (X, O)}
+    moves = {X: [], O: []}
+    while not (board.x_lines or board.o_lines or board.is_full()):
+        config = configs[side]
+        pool = pools.get(config["workers"]) if pools else None
+        index, seconds, nodes = engine_move(config, board, side, tables[side], pool)
+        board.play(index, side)
+        moves[side].append((seconds, nodes))
+        side = O if side == X else X
+    winner = X if board.x_lines else O if board.o_lines else None
+    return {"winner": winner, "moves": moves}
+
+
+def schedule(configs, openings, size, k, tt_bytes):
+    """Gera as tarefas de play_game: cada par de configurações, cada abertura, nas duas cores."""
+    for (a, first), (b, second) in itertools.combinations(enumerate(configs), 2):
+        for opening in openings:
+            yield (a, b), (size, k, opening, {X: first, O: second}, tt_bytes)
+            yield (b, a), (size, k, opening, {X: second, O: first}, tt_bytes)
+
+
+def _play_numbered(item):
+    players, task = item
+    return players, play_game(task)
+
+
+def percentile(values, fraction):
+    """Percentil pelo método do posto mais próximo."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run(configs, openings, size, k=None, parallel=1, tt_bytes=DEFAULT_TT_BYTES, log=None):
+    """Joga o torneio e retorna a lista com o resumo de cada configuração (ver summarize)."""
+    records = [{"wins": 0, "draws": 0, "losses": 0, "latencies": [], "nodes": []} for _ in configs]
+    tasks = list(schedule(configs, openings, size, k, tt_bytes))
+    pool = None
+    pools = {}
+    try:
+        if parallel > 1:
+            pool = multiprocessing.Pool(parallel)
+            results = pool.imap_unordered(_play_numbered, tasks)
+        else:
+            if size > 3:
+                from engine.pool import EnginePool  # importado só quando há busca paralela
+                for workers in {config["workers"] for config in configs if config["workers"] > 1}:
+                    pools[workers] = EnginePool(workers, tt_bytes)
+            results = ((players, play_game(task, pools)) for players, task in tasks)
+
+        for played, (players, game) in enumerate(results, 1):
+            for player, index in zip((X, O), players):
+                record = records[index]
+                if game["winner"] is None:
+                    record["draws"] += 1
+                elif game["winner"] == player:
+                    record["wins"] += 1
+                else:
+                    record["losses"] += 1
+                for seconds, nodes in game["moves"][player]:
+                    record["latencies"].append(seconds * 1000)
+                    record["nodes"].append(nodes)
+            if log is not None:
+                x_name, o_name = (configs[index]["name"] for index in players)
+                log(f"game {played}/{len(tasks)}: {x_name} (X) vs {o_name} (O): "
+                    f"{game['winner'] + ' wins' if game['winner'] else 'draw'}")
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for engine_pool in pools.values():
+            engine_pool.close()
+    return [summarize(config, record) for config, record in zip(configs, records)]
+
+
+def summarize(config, record):
+    """Resumo de uma configuração: resultados, pontuação, latência, nós e custo em CPU por jogada."""
+    games = record["wins"] + record["draws"] + record["losses"]
+    latencies = record["latencies"] or [0.0]
+    mean_ms = statistics.fmean(latencies)
+    return {"config": config, "games": games, "wins": record["wins"], "draws": record["draws"],
+            "losses": record["losses"],
+            "score": round((record["wins"] + record["draws"] / 2) / games, 3) if games else None,
+            "mean_ms": round(mean_ms, 3), "p95_ms": round(percentile(latencies, 0.95), 3),
+            "nodes_per_move": round(statistics.fmean(record["nodes"] or [0])),
+            "cpu_ms_per_move": round(mean_ms * config["workers"], 3)}
+
+
+def cheapest(summary, target):
+    """A configuração de menor custo em CPU por jogada com pontuação de pelo menos ``target`` (ou None)."""
+    eligible = [entry for entry in summary if entry["score"] is not None and entry["score"] >= target]
+    return min(eligible, key=lambda entry: entry["cpu_ms_per_move"]) if eligible else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play engine configurations against each other.")
+    parser.add_argument("--config", action="append", required=True,
+                        help="engine configuration, e.g. depth=4 or algorithm=mcts,time_ms=200 (repeatable)")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--k", type=int, help="stones in a row to win (default: the board size)")
+    parser.add_argument("--openings", type=int, default=4, help="number of random openings")
+    parser.add_argument("--opening-plies", type=int, default=DEFAULT_OPENING_PLIES,
+                        help="random moves played in each opening")
+    parser.add_argument("--book", help="read openings from this file (engine.batch text format) instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--parallel", type=int,
+                        help="games played at once (default: one per CPU, or 1 if a config uses workers)")
+    parser.add_argument("--tt-mb", type=int, default=DEFAULT_TT_BYTES // (1024 * 1024),
+                        help="transposition table size per side, in MB")
+    parser.add_argument("--target", type=float, help="report the cheapest configuration scoring at least this")
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.size < 3 or (args.k is not None and not 3 <= args.k <= args.size):
+        parser.error("invalid --size or --k")
+    if len(args.config) < 2:
+        parser.error("at least two --config are needed")
+    if args.openings < 1:
+        parser.error("--openings must be at least 1")
+    try:
+        configs = [parse_config(text) for text in args.config]
+        openings = (book_openings(args.book, args.size) if args.book else
+                    random_openings(args.size, args.k, args.openings, args.opening_plies, args.seed))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not openings:
+        parser.error("no openings to play: the book is empty or every random opening ended the game")
+    multi_worker = any(config["workers"] > 1 for config in configs)
+    if args.parallel is None:
+        args.parallel = 1 if multi_worker else multiprocessing.cpu_count()
+    if args.parallel > 1 and multi_worker:
+        parser.error("configs with more than one worker need --parallel 1")
+
+    summary = run(configs, openings, args.size, args.k, args.parallel, args.tt_mb * 1024 * 1024,
+                  log=lambda line: print(line, file=sys.stderr))
+    width = max(len(entry["config"]["name"]) for entry in summary)
+    print(f"{'config':{width}}  games   W   D   L  score  mean ms   p95 ms  nodes/move  cpu ms/move")
+    for entry in sorted(summary, key=lambda entry: -(entry["score"] or 0)):
+        score = "-" if entry["score"] is None else f"{entry['score']:.3f}"
+        print(f"{entry['config']['name']:{width}}  {entry['games']:5} {entry['wins']:3} {entry['draws']:3} "
+              f"{entry['losses']:3}  {score:>5} {entry['mean_ms']:8.1f} {entry['p95_ms']:8.1f} "
+              f"{entry['nodes_per_move']:11} {entry['cpu_ms_per_move']:12.1f}")
+    if args.target is not None:
+        best = cheapest(summary, args.target)
+        print(f"cheapest config scoring >= {args.target}: {best['config']['name'] if best else 'none'}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"size": args.size, "k": args.k or args.size, "openings": [list(o) for o in openings],
+                       "summary": summary}, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
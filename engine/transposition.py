@@ -0,0 +1,114 @@
+"""
+Tabela de transposição para o minimax, indexada pelo hash de Zobrist do Bitboard.
+
+Cada entrada guarda a profundidade restante da busca, a pontuação, o tipo de
+limite (exato, inferior ou superior) e a melhor jogada encontrada. A tabela é
+dividida em buckets de duas posições: a primeira prefere entradas mais
+profundas (ou da busca atual) e a segunda é sempre substituída.
+"""
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Pontuações acima deste valor (em módulo) são vitórias/derrotas forçadas
+WIN_THRESHOLD = 500
+
+# Estimativa do custo em memória de uma entrada (tupla + inteiros)
+ENTRY_BYTES = 128
+
+DEFAULT_TT_BYTES = 64 * 1024 * 1024
+
+
+def score_to_tt(score, depth):
+    """Converte pontuações de vitória para a distância a partir do nó atual."""
+    if score >= WIN_THRESHOLD:
+        return score + depth
+    if score <= -WIN_THRESHOLD:
+        return score - depth
+    return score
+
+
+def score_from_tt(score, depth):
+    """Converte pontuações de vitória guardadas de volta para a distância da raiz."""
+    if score >= WIN_THRESHOLD:
+        return score - depth
+    if score <= -WIN_THRESHOLD:
+        return score + depth
+    return score
+
+
+class TranspositionTable:
+    """
+    Tabela de transposição de tamanho limitado.
+
+    ``max_bytes`` define o limite aproximado de memória; o número de buckets é
+    arredondado para uma potência de dois. Os contadores ``hits``, ``misses`` e
+    ``stores`` acumulam desde a criação (ou o último ``clear``).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_TT_BYTES):
+        buckets = max(1, max_bytes // (2 * ENTRY_BYTES))
+        self.num_buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = self.num_buckets - 1
+        self.slots = [None] * (2 * self.num_buckets)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        return sum(1 for entry in self.slots if entry is not None)
+
+    def new_search(self):
+        """Marca o início de uma nova busca; entradas antigas passam a ser substituíveis."""
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * (2 * self.num_buckets)
+        self.generation = 0
+        self.hits = self.misses = self.stores = 0
+
+    def probe(self, key):
+        """Retorna a entrada (key, depth, score, flag, move, generation) da posição ou None."""
+        slot = (key & self.mask) << 1
+        slots = self.slots
+        entry = slots[slot]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = slots[slot + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        """Guarda o resultado da busca de uma posição."""
+        slot = (key & self.mask) << 1
+        slots = self.slots
+        entry = (key, depth, score, flag, move, self.generation)
+        old = slots[slot]
+        # Posição preferida por profundidade: substitui se vazia, mesma posição,
+        # de uma busca anterior ou com profundidade menor ou igual
+        if (old is None or old[0] == key or old[5] != self.generation
+                or old[1] <= depth):
+            if old is not None and old[0] != key:
+                # A entrada desalojada ainda é útil; vai para a posição sempre-substitui
+                slots[slot + 1] = old
+            slots[slot] = entry
+        else:
+            slots[slot + 1] = entry
+        self.stores += 1
+
+    def stats(self):
+        """Retorna os contadores da tabela em um dicionário."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "capacity": len(self.slots),
+        }
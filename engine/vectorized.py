@@ -0,0 +1,86 @@
+"""
+Avaliação heurística vetorizada com NumPy, para muitas posições de uma vez.
+
+As posições são empilhadas em um array N x size x size int8 (0 vazia, 1 X,
+2 O). Para cada (tamanho, k) são pré-calculadas a matriz com as casas de cada
+linha vencedora (linhas x k) e a tabela de pontos por (peças de X, peças de O)
+em uma linha, então o lote inteiro é pontuado com uma indexação, duas somas e
+uma consulta à tabela, sem laços em Python por posição ou por linha. O score é
+o mesmo de engine.search.evaluate_position.
+
+Na busca, o Bitboard já mantém o score como soma corrente a cada jogada, então
+avaliar uma folha não custa nada; o ganho deste módulo é nas análises de muitas
+posições soltas (``python -m engine.batch --static``), em que cada Bitboard
+teria de ser montado só para ser avaliado uma vez.
+
+NumPy é opcional: sem ele, HAVE_NUMPY é falso e ``evaluate_positions`` monta
+um Bitboard por posição.
+"""
+
+from engine.bitboard import Bitboard, iter_bits, line_masks, line_score, window_weights
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Valores das casas no array de posições
+EMPTY_CELL, X_CELL, O_CELL = 0, 1, 2
+
+# Cache de (casas de cada linha, pontos por contagem) por (tamanho, k)
+_LINE_TABLES = {}
+
+
+def line_tables(size, k=None):
+    """
+    Retorna (casas, pontos): ``casas`` é a matriz linhas x k com os índices das
+    casas de cada linha vencedora e ``pontos[x, o]`` o valor de uma linha com x
+    peças de X e o peças de O (line_score).
+    """
+    k = size if k is None else k
+    tables = _LINE_TABLES.get((size, k))
+    if tables is None:
+        cells = np.array([list(iter_bits(mask)) for mask in line_masks(size, k)], dtype=np.intp)
+        weights = window_weights(size, k)
+        points = np.array([[line_score(xc, oc, weights) for oc in range(k + 1)] for xc in range(k + 1)],
+                          dtype=np.int64)
+        tables = _LINE_TABLES[(size, k)] = (cells, points)
+    return tables
+
+
+def positions_array(size, positions):
+    """Empilha as posições (x, o) de um mesmo tamanho em um array N x size x size int8."""
+    cells = size * size
+    width = (cells + 7) // 8
+    x = b"".join(x.to_bytes(width, "little") for x, _ in positions)
+    o = b"".join(o.to_bytes(width, "little") for _, o in positions)
+    x_bits = np.unpackbits(np.frombuffer(x, np.uint8).reshape(-1, width), axis=1, count=cells, bitorder="little")
+    o_bits = np.unpackbits(np.frombuffer(o, np.uint8).reshape(-1, width), axis=1, count=cells, bitorder="little")
+    return (x_bits * X_CELL + o_bits * O_CELL).astype(np.int8).reshape(-1, size, size)
+
+
+def evaluate_boards(boards, k=None):
+    """
+    Avalia de uma vez um array N x size x size de posições e retorna o array com
+    os N scores (positivos para O). ``k`` é o número de peças em linha para vencer.
+    """
+    count, size = boards.shape[0], boards.shape[1]
+    cells, points = line_tables(size, k)
+    lines = boards.reshape(count, size * size)[:, cells]  # N x linhas x k
+    x_counts = (lines == X_CELL).sum(axis=2)
+    o_counts = (lines == O_CELL).sum(axis=2)
+    return points[x_counts, o_counts].sum(axis=1)
+
+
+def evaluate_positions(size, positions, k=None):
+    """
+    Retorna a lista com o score heurístico (positivo para O) de cada posição
+    (x, o) de tamanho ``size``; usa evaluate_boards quando NumPy está instalado.
+    """
+    if not positions:
+        return []
+    if np is None:
+        return [Bitboard(size, x, o, k).score for x, o in positions]
+    return evaluate_boards(positions_array(size, positions), k).tolist()
@@ -0,0 +1,56 @@
+"""Funções auxiliares dos testes: posições sorteadas e resolução por força bruta."""
+
+import random
+
+from engine.bitboard import O, X, Bitboard, iter_bits
+
+
+def other(player):
+    return O if player == X else X
+
+
+def is_over(board):
+    return bool(board.x_lines or board.o_lines or board.is_full())
+
+
+def random_positions(size, k, count, min_plies, max_plies, seed):
+    """Sorteia ``count`` posições em andamento como (Bitboard, jogador da vez), por jogadas ao acaso."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Bitboard(size, k=k)
+        player = X
+        for _ in range(rng.randint(min_plies, max_plies)):
+            board.play(rng.choice(list(iter_bits(board.empty_mask()))), player)
+            player = other(player)
+            if is_over(board):
+                break
+        if not is_over(board):
+            positions.append((board, player))
+    return positions
+
+
+def brute_force(board, player, memo):
+    """
+    Resolve a posição por busca exaustiva. Retorna (valor, distância) para quem
+    joga: valor 1, 0 ou -1 e os lances até o fim, com a vitória mais curta e a
+    derrota mais longa.
+    """
+    key = (board.size, board.k, board.x, board.o, player)
+    if key in memo:
+        return memo[key]
+    if board.has_won(other(player)):
+        result = (-1, 0)
+    elif board.is_full():
+        result = (0, 0)
+    else:
+        children = []
+        for index in iter_bits(board.empty_mask()):
+            board.play(index, player)
+            value, distance = brute_force(board, other(player), memo)
+            board.undo(index, player)
+            children.append((-value, distance + 1))
+        # Melhor valor; entre iguais, a vitória mais curta e a derrota mais longa
+        result = max(children, key=lambda child: (child[0], -child[1] if child[0] > 0 else child[1]))
+    memo[key] = result
+    return result
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from engine.batch import (MAX_BINARY_SIZE, RECORD, analyze_batch, format_position, parse_position,
+                          read_binary_positions)
+from engine.bitboard import O, X
+from tests.helpers import random_positions
+
+
+def test_binary_records_round_trip():
+    positions = [(board.size, board.x, board.o, player)
+                 for size in (3, 4, 5) for board, player in random_positions(size, size, 5, 0, 8, seed=size)]
+    stream = io.BytesIO(b"".join(RECORD.pack(size, 1 if side == O else 0, x, o) for size, x, o, side in positions))
+    assert list(read_binary_positions(stream)) == positions
+
+
+def test_binary_records_reject_large_boards_and_truncation():
+    with pytest.raises(ValueError):
+        list(read_binary_positions(io.BytesIO(RECORD.pack(MAX_BINARY_SIZE + 1, 0, 1, 2))))
+    with pytest.raises(ValueError):
+        list(read_binary_positions(io.BytesIO(RECORD.pack(3, 0, 1, 2)[:-1])))
+
+
+def test_text_positions_round_trip():
+    for board, player in random_positions(7, 4, 10, 0, 12, seed=11):
+        text = f"{format_position(board.size, board.x, board.o)} {player}"
+        assert parse_position(text) == (board.size, board.x, board.o, player)
+    assert parse_position("X........")[3] == O
+    assert parse_position("XO.......")[3] == X
+
+
+def test_analyze_batch_checks_arguments_at_the_call():
+    with pytest.raises(ValueError):
+        analyze_batch(["X........"])
+    results = list(analyze_batch(["X........", "XX.OO...."], depth=9, num_workers=1))
+    assert results[1]["best_move"] == [0, 2]
@@ -0,0 +1,37 @@
+import random
+
+from engine.bitboard import O, X, Bitboard, iter_bits
+
+STATE = ("x", "o", "hash", "x_counts", "o_counts", "x_lines", "o_lines", "x_threats", "o_threats", "score")
+
+
+def state(board):
+    return {name: getattr(board, name) for name in STATE}
+
+
+def test_play_matches_a_fresh_board_and_undo_restores_the_state():
+    rng = random.Random(1)
+    for size, k in ((3, 3), (4, 4), (5, 5), (7, 4), (15, 5)):
+        for _ in range(20):
+            board = Bitboard(size, k=k)
+            initial = state(board)
+            played = []
+            player = X
+            while not (board.x_lines or board.o_lines or board.is_full()) and len(played) < 30:
+                index = rng.choice(list(iter_bits(board.empty_mask())))
+                board.play(index, player)
+                played.append((index, player))
+                assert state(board) == state(Bitboard(size, board.x, board.o, k))
+                player = O if player == X else X
+            for index, mover in reversed(played):
+                board.undo(index, mover)
+            assert state(board) == initial
+
+
+def test_copy_and_pickle_keep_the_position():
+    import pickle
+    board = Bitboard(7, k=4)
+    board.play(24, X)
+    board.play(25, O)
+    assert state(board.copy()) == state(board)
+    assert state(pickle.loads(pickle.dumps(board))) == state(board)
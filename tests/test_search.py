@@ -0,0 +1,20 @@
+from engine.bitboard import O
+from engine.search import WIN_THRESHOLD, choose_move, evaluate_position
+from tests.helpers import brute_force, random_positions
+
+
+def test_full_depth_minimax_matches_exhaustive_search():
+    memo = {}
+    for board, player in random_positions(3, 3, 30, 0, 7, seed=5):
+        if player != O:
+            continue
+        _, score = choose_move(board, 9, 1, solver_nodes=0, use_tablebase=False)
+        value = 1 if score >= WIN_THRESHOLD else -1 if score <= -WIN_THRESHOLD else 0
+        assert value == brute_force(board, O, memo)[0]
+
+
+def test_evaluate_position_accepts_list_boards():
+    rows = [["X", " ", " "], [" ", "O", " "], [" ", " ", " "]]
+    board, _ = random_positions(3, 3, 1, 2, 2, seed=7)[0]
+    assert evaluate_position(rows) == evaluate_position(board.from_rows(rows))
+    assert evaluate_position(board) == board.score
@@ -0,0 +1,16 @@
+import pytest
+
+from engine.server import parse_request
+
+
+def test_parse_request_rejects_booleans_and_values_above_the_limits():
+    for request in ({"position": "." * 9, "depth": True}, {"position": "." * 9, "depth": 20},
+                    {"position": "." * 9, "time_ms": 10 ** 9}, {"position": "." * 9}):
+        with pytest.raises(ValueError):
+            parse_request(request, max_depth=16)
+
+
+def test_parse_request_bounds_depth_only_requests_by_the_time_limit():
+    position, k, depth, time_ms, algorithm, playouts = parse_request({"position": "X........", "depth": 4},
+                                                                     max_time_ms=500)
+    assert position == (3, 1, 0, "O") and depth == 4 and time_ms == 500
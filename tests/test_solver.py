@@ -0,0 +1,23 @@
+from engine.solver import DRAW, LOSS, WIN, solve
+from tests.helpers import brute_force, other, random_positions
+
+VALUES = {WIN: 1, DRAW: 0, LOSS: -1}
+
+
+def test_solver_matches_exhaustive_search():
+    memo = {}
+    for size, k, min_plies in ((3, 3, 0), (4, 4, 7), (4, 3, 4)):
+        for board, player in random_positions(size, k, 25, min_plies, size * size - 2, seed=size * 10 + k):
+            result, move, _, _ = solve(board, player, 10 ** 6)
+            value, _ = brute_force(board, player, memo)
+            assert VALUES[result] == value
+            if result in (WIN, DRAW):
+                # A jogada da prova mantém o resultado
+                board.play(move, player)
+                assert -brute_force(board, other(player), memo)[0] == value
+                board.undo(move, player)
+
+
+def test_solver_gives_up_when_the_node_limit_is_reached():
+    board, player = random_positions(5, 5, 1, 2, 2, seed=3)[0]
+    assert solve(board, player, 50) == (None, None, None, solve(board, player, 50)[3])
@@ -0,0 +1,57 @@
+import pytest
+
+from engine.bitboard import O
+from engine.solver import DRAW, LOSS, WIN
+from engine.tablebase import TOTAL_POSITIONS, Tablebase, build, colex_rank, load_tablebase, position_index
+from tests.helpers import brute_force, other, random_positions
+
+VALUES = {WIN: 1, DRAW: 0, LOSS: -1}
+
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    pytest.importorskip("numpy")
+    path = str(tmp_path_factory.mktemp("tablebase") / "tablebase4x4.bin")
+    build(path, processes=2)
+    tablebase = Tablebase(path)
+    yield tablebase
+    tablebase.close()
+
+
+def test_colex_rank_orders_masks_with_the_same_bit_count():
+    for count in range(5):
+        masks = [mask for mask in range(1 << 8) if mask.bit_count() == count]
+        assert [colex_rank(mask) for mask in masks] == list(range(len(masks)))
+
+
+def test_position_index_is_a_perfect_ranking():
+    seen = set()
+    for board, player in random_positions(4, 4, 300, 0, 15, seed=13):
+        mover, rest = (board.o, board.x) if player == O else (board.x, board.o)
+        index = position_index(mover, rest)
+        assert 0 <= index < TOTAL_POSITIONS
+        seen.add((index, board.x, board.o))
+    assert len({index for index, _, _ in seen}) == len(seen)
+    assert position_index(0b11, 0) is None
+
+
+def test_tablebase_matches_exhaustive_search(tablebase):
+    memo = {}
+    assert tablebase.probe(0, 0) == (DRAW, 16)
+    for board, player in random_positions(4, 4, 200, 7, 14, seed=17):
+        mover, rest = (board.o, board.x) if player == O else (board.x, board.o)
+        result, distance = tablebase.probe(mover, rest)
+        value, exact = brute_force(board, player, memo)
+        assert VALUES[result] == value
+        if value:
+            assert distance == exact
+        move, _ = tablebase.best_move(board, player)
+        board.play(move, player)
+        assert -brute_force(board, other(player), memo)[0] == value
+        board.undo(move, player)
+
+
+def test_unreadable_tablebase_falls_back(tmp_path):
+    path = tmp_path / "broken.bin"
+    path.write_bytes(b"PGTB" + bytes(10))
+    assert load_tablebase(str(path)) is None
@@ -1,183 +1,39 @@
-import tkinter as tk
-from tkinter import messagebox
+import argparse
 import multiprocessing
-import copy
 import logging
+import threading
 
-# Configura logging para depuração
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Com o método "spawn", cada worker reexecuta este arquivo como __mp_main__; os
+# workers só precisam do pacote engine, então a interface e o logging ficam de fora
+if __name__ != '__mp_main__':
+    import tkinter as tk
+    from tkinter import messagebox
 
-def evaluate_move(args):
-    """
-    Avalia um movimento no minimax em um processo separado.
-    Recebe apenas dados serializáveis para evitar erros de pickling.
-    """
-    try:
-        board, row, col, current_player, alpha, beta, depth, max_depth = args
-        logging.debug(f"Avaliando movimento ({row}, {col}) para jogador {current_player}")
-        
-        board = copy.deepcopy(board)
-        board[row][col] = current_player
-        
-        # Avalia a posição resultante
-        score = minimax(board, "O" if current_player == "X" else "X", alpha, beta, depth + 1, max_depth, False)
-        
-        return {"row": row, "col": col, "score": score}
-    except Exception as e:
-        logging.error(f"Erro em evaluate_move: {e}")
-        raise
+    # Configura logging para depuração
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def minimax(board, current_player, alpha, beta, depth, max_depth, is_maximizing):
-    """
-    Algoritmo minimax com poda alfa-beta simplificado.
-    """
-    try:
-        size = len(board)
-        
-        # Verifica condições de término
-        if check_win_state(board, "X"):
-            return -1000 + depth  # Vitória do adversário (quanto mais rápido, melhor)
-        elif check_win_state(board, "O"):
-            return 1000 - depth   # Vitória do computador (quanto mais rápido, melhor)
-        elif not any(" " in row for row in board):
-            return 0  # Empate
-        elif depth >= max_depth:
-            return evaluate_position(board)  # Avaliação heurística
-        
-        empty_cells = [(r, c) for r in range(size) for c in range(size) if board[r][c] == " "]
-        
-        if current_player == "O":  # Maximizando (computador)
-            max_eval = -float('inf')
-            for r, c in empty_cells:
-                board[r][c] = current_player
-                eval_score = minimax(board, "X", alpha, beta, depth + 1, max_depth, False)
-                board[r][c] = " "
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:  # Minimizando (jogador)
-            min_eval = float('inf')
-            for r, c in empty_cells:
-                board[r][c] = current_player
-                eval_score = minimax(board, "O", alpha, beta, depth + 1, max_depth, True)
-                board[r][c] = " "
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
-            
-    except Exception as e:
-        logging.error(f"Erro em minimax: {e}")
-        raise
-
-def check_win_state(board, player):
-    """Verifica se o jogador venceu."""
-    size = len(board)
-    # Verifica linhas
-    for row in range(size):
-        if all(board[row][col] == player for col in range(size)):
-            return True
-    # Verifica colunas
-    for col in range(size):
-        if all(board[row][col] == player for row in range(size)):
-            return True
-    # Verifica diagonal principal
-    if all(board[i][i] == player for i in range(size)):
-        return True
-    # Verifica diagonal secundária
-    if all(board[i][size-i-1] == player for i in range(size)):
-        return True
-    return False
+from engine.bitboard import Bitboard
+from engine.ordering import MoveOrderer
+from engine.ponder import Ponderer
+from engine.pool import EnginePool
+from engine.search import check_win_state, computer_move
+from engine.stats import SearchStats
+from engine.transposition import DEFAULT_TT_BYTES, TranspositionTable
 
-def evaluate_position(board):
-    """
-    Avaliação heurística simples da posição.
-    Pontos positivos para o computador (O), negativos para o jogador (X).
-    """
-    size = len(board)
-    score = 0
-    
-    # Avalia linhas, colunas e diagonais
-    lines = []
-    
-    # Adiciona linhas
-    for row in range(size):
-        lines.append([board[row][col] for col in range(size)])
-    
-    # Adiciona colunas
-    for col in range(size):
-        lines.append([board[row][col] for row in range(size)])
-    
-    # Adiciona diagonais
-    lines.append([board[i][i] for i in range(size)])
-    lines.append([board[i][size-i-1] for i in range(size)])
-    
-    # Pontua cada linha
-    for line in lines:
-        o_count = line.count("O")
-        x_count = line.count("X")
-        empty_count = line.count(" ")
-        
-        if x_count == 0 and o_count > 0:
-            score += o_count * o_count
-        elif o_count == 0 and x_count > 0:
-            score -= x_count * x_count
-    
-    return score
-
-def computer_move(board, max_depth, num_workers):
-    """
-    Função para calcular a jogada do computador usando minimax com paralelização.
-    """
-    try:
-        logging.info("Calculando jogada do computador")
-        size = len(board)
-        empty_cells = [(r, c) for r in range(size) for c in range(size) if board[r][c] == " "]
-        
-        if not empty_cells:
-            return None
-        
-        # Para tabuleiros pequenos ou poucas jogadas, não usa paralelização
-        if len(empty_cells) <= 4 or size <= 3:
-            best_score = -float('inf')
-            best_move = None
-            
-            for r, c in empty_cells:
-                board[r][c] = "O"
-                score = minimax(board, "X", -float('inf'), float('inf'), 1, max_depth, False)
-                board[r][c] = " "
-                
-                if score > best_score:
-                    best_score = score
-                    best_move = (r, c)
-            
-            return best_move
-        
-        # Para tabuleiros maiores, usa paralelização
-        with multiprocessing.Pool(processes=min(num_workers, len(empty_cells))) as pool:
-            args = [(board, r, c, "O", -float('inf'), float('inf'), 0, max_depth) for r, c in empty_cells]
-            results = pool.map(evaluate_move, args)
-        
-        if not results:
-            return None
-            
-        best_move = max(results, key=lambda x: x["score"])
-        logging.info(f"Melhor jogada encontrada: ({best_move['row']}, {best_move['col']}) com score {best_move['score']}")
-        return best_move["row"], best_move["col"]
-        
-    except Exception as e:
-        logging.error(f"Erro em computer_move: {e}")
-        raise
+# Variantes oferecidas na tela inicial: (tamanho do tabuleiro, peças em linha para vencer)
+BOARD_VARIANTS = ((3, 3), (4, 4), (5, 5), (7, 4), (15, 5))
 
 class JogoDaVelha:
-    def __init__(self):
-        """Inicializa a interface gráfica e variáveis do jogo."""
+    def __init__(self, server_address=None):
+        """
+        Inicializa a interface gráfica e variáveis do jogo. Com ``server_address``
+        ("host:porta" ou socket Unix), as jogadas do computador são pedidas a um
+        engine.server em vez de calculadas por um pool próprio.
+        """
         self.window = tk.Tk()
         self.window.title("Jogo da Velha")
         self.size = None
+        self.k = None  # Peças em linha para vencer
         self.board = None
         self.current_player = "X"
         self.buttons = []
@@ -187,23 +43,64 @@ class JogoDaVelha:
         # Configurações
         self.num_workers = min(4, multiprocessing.cpu_count())
         self.max_depth = 8
+        self.time_budget_ms = None  # None: profundidade fixa; senão, tempo por jogada
+        self.algorithm = "minimax"  # "minimax" ou "mcts"
+        self.tt_bytes = DEFAULT_TT_BYTES
+        self.transposition_table = None  # Mantida entre as jogadas de uma partida
+        self.engine_pool = None  # Pool de busca criado uma vez por partida
+        self.move_orderer = None  # Killers e histórico mantidos entre as jogadas
+        self.game_id = 0  # Identifica a partida atual para descartar resultados antigos
+        self.ponderer = None  # Busca em segundo plano durante a vez do humano
+        self.search_cancel = None  # Cancela a busca do computador em andamento
+        self.server_address = server_address
+        self.engine_client = None  # Conexão com o engine.server da partida
         
         self.frame = tk.Frame(self.window)
         self.frame.pack(pady=20)
         
         tk.Label(self.frame, text="Escolha o tamanho:", font=("Arial", 14)).pack(pady=10)
-        tk.Button(self.frame, text="3x3", command=lambda: self.show_config(3)).pack(side=tk.LEFT, padx=10)
-        tk.Button(self.frame, text="4x4", command=lambda: self.show_config(4)).pack(side=tk.LEFT, padx=10)
-        tk.Button(self.frame, text="5x5", command=lambda: self.show_config(5)).pack(side=tk.LEFT, padx=10)
+        self.add_variant_buttons()
+        
+        # Encerra os workers ao fechar a janela
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def add_variant_buttons(self):
+        """Cria um botão para cada variante de BOARD_VARIANTS."""
+        for size, k in BOARD_VARIANTS:
+            text = f"{size}x{size}" if k == size else f"{size}x{size} ({k} em linha)"
+            tk.Button(self.frame, text=text, command=lambda s=size, k=k: self.show_config(s, k)).pack(side=tk.LEFT,
+                                                                                                 padx=10)
         
-    def show_config(self, size):
-        """Exibe tela de configuração para profundidade e número de workers."""
+    def show_config(self, size, k=None):
+        """Exibe tela de configuração para profundidade, tempo por jogada e número de workers."""
         self.size = size
+        self.k = size if k is None else k
         self.frame.destroy()
         self.frame = tk.Frame(self.window)
         self.frame.pack(pady=20)
         
-        tk.Label(self.frame, text="Profundidade (1-12):", font=("Arial", 12)).pack(pady=5)
+        # Modo de busca: profundidade fixa ou tempo por jogada (aprofundamento iterativo)
+        # Com k menor que o tamanho, a profundidade fixa é cara demais: o padrão é o tempo por jogada
+        self.mode_var = tk.StringVar(value="depth" if self.k == size else "time")
+        tk.Radiobutton(self.frame, text="Profundidade fixa", variable=self.mode_var, value="depth",
+                       font=("Arial", 12)).pack(anchor=tk.W)
+        tk.Radiobutton(self.frame, text="Tempo por jogada", variable=self.mode_var, value="time",
+                       font=("Arial", 12)).pack(anchor=tk.W)
+        
+        # Algoritmo de busca: minimax com poda alfa-beta ou Monte Carlo (MCTS)
+        self.algorithm_var = tk.StringVar(value="minimax")
+        tk.Radiobutton(self.frame, text="Minimax (alfa-beta)", variable=self.algorithm_var, value="minimax",
+                       font=("Arial", 12)).pack(anchor=tk.W)
+        tk.Radiobutton(self.frame, text="MCTS (tempo por jogada, ou simulações conforme o tabuleiro)",
+                       variable=self.algorithm_var, value="mcts", font=("Arial", 12)).pack(anchor=tk.W)
+        
+        tk.Label(self.frame, text="Tempo por jogada em ms (100-60000):", font=("Arial", 12)).pack(pady=5)
+        self.time_entry = tk.Spinbox(self.frame, from_=100, to=60000, increment=100, width=7, font=("Arial", 12))
+        self.time_entry.delete(0, tk.END)
+        self.time_entry.insert(0, "1000")
+        self.time_entry.pack(pady=5)
+        
+        tk.Label(self.frame, text="Profundidade (1-12, máxima no modo por tempo):", font=("Arial", 12)).pack(pady=5)
         self.depth_entry = tk.Spinbox(self.frame, from_=1, to=12, width=5, font=("Arial", 12))
         self.depth_entry.delete(0, tk.END)  # Remove o conteúdo atual
         self.depth_entry.insert(0, "8")     # Define o valor padrão como "8"
@@ -221,6 +118,11 @@ class JogoDaVelha:
         """Inicia o jogo com as configurações escolhidas."""
         try:
             self.max_depth = int(self.depth_entry.get())
+            self.algorithm = self.algorithm_var.get()
+            if self.mode_var.get() == "time":
+                self.time_budget_ms = int(self.time_entry.get())
+            else:
+                self.time_budget_ms = None
             workers_input = int(self.workers_entry.get())
             cpu_count = multiprocessing.cpu_count()
             self.num_workers = min(workers_input, cpu_count)
@@ -234,23 +136,55 @@ class JogoDaVelha:
         if self.max_depth < 1 or self.max_depth > 12 or self.num_workers < 1 or self.num_workers > 20:
             messagebox.showerror("Erro", "Profundidade deve estar entre 1 e 12, e workers entre 1 e 20.")
             return
+        if self.time_budget_ms is not None and not 100 <= self.time_budget_ms <= 60000:
+            messagebox.showerror("Erro", "Tempo por jogada deve estar entre 100 e 60000 ms.")
+            return
             
-        logging.info(f"Iniciando jogo com profundidade {self.max_depth} e {self.num_workers} workers")
+        if self.time_budget_ms is not None:
+            logging.info(f"Iniciando jogo com {self.time_budget_ms} ms por jogada (profundidade máxima "
+                         f"{self.max_depth}) e {self.num_workers} workers")
+        else:
+            logging.info(f"Iniciando jogo com profundidade {self.max_depth} e {self.num_workers} workers")
+        logging.info(f"Algoritmo de busca: {self.algorithm}")
         
         self.board = [[" " for _ in range(self.size)] for _ in range(self.size)]
         self.current_player = "X"
+        self.transposition_table = TranspositionTable(self.tt_bytes)
+        self.move_orderer = MoveOrderer()
+        self.game_id += 1
+        
+        if self.server_address is not None:
+            # As buscas rodam no pool do servidor: não há pool nem ponderação locais
+            from engine.server import EngineClient  # importado só quando há servidor
+            try:
+                self.engine_client = EngineClient(self.server_address)
+            except OSError as e:
+                messagebox.showerror("Erro", f"Não foi possível conectar ao servidor {self.server_address}: {e}")
+                return
+        # O tabuleiro 3x3 é sempre calculado sem paralelização
+        elif self.size > 3 and self.num_workers > 1:
+            self.engine_pool = EnginePool(self.num_workers, self.tt_bytes)
+        # A ponderação reaproveita a tabela de transposição, que só o minimax usa
+        if self.algorithm == "minimax" and self.engine_client is None:
+            self.ponderer = Ponderer(self.max_depth, self.num_workers, self.transposition_table, self.tt_bytes,
+                                     self.time_budget_ms, self.engine_pool, self.move_orderer)
         
         self.frame.destroy()
         self.frame = tk.Frame(self.window)
         self.frame.pack(pady=20)
         
+        # Casas menores nos tabuleiros grandes, para caber na tela
+        if self.size <= 5:
+            cell_font, cell_width, cell_height, cell_pad = 20, 4, 2, 5
+        else:
+            cell_font, cell_width, cell_height, cell_pad = 10, 2, 1, 1
         self.buttons = []
         for row in range(self.size):
             row_buttons = []
             for col in range(self.size):
-                btn = tk.Button(self.frame, text="", font=("Arial", 20), width=4, height=2,
+                btn = tk.Button(self.frame, text="", font=("Arial", cell_font), width=cell_width, height=cell_height,
                               command=lambda r=row, c=col: self.make_move(r, c))
-                btn.grid(row=row, column=col, padx=5, pady=5)
+                btn.grid(row=row, column=col, padx=cell_pad, pady=cell_pad)
                 row_buttons.append(btn)
             self.buttons.append(row_buttons)
         
@@ -262,6 +196,12 @@ class JogoDaVelha:
         self.thinking_label.pack(pady=5)
         
         self.update_board()
+        self.start_pondering()
+        
+    def start_pondering(self):
+        """Começa a calcular as respostas às jogadas prováveis do humano."""
+        if self.ponderer is not None:
+            self.ponderer.start(Bitboard.from_rows(self.board, self.k))
         
     def update_board(self):
         """Atualiza a interface gráfica com o estado do tabuleiro."""
@@ -295,25 +235,49 @@ class JogoDaVelha:
         self.window.update()
         
         # Executa a jogada do computador em uma thread separada
-        import threading
+        self.search_cancel = threading.Event()
         thread = threading.Thread(target=self.computer_move_thread)
         thread.daemon = True
         thread.start()
         
     def computer_move_thread(self):
         """Executa a jogada do computador em uma thread separada."""
+        game_id = self.game_id
+        cancel = self.search_cancel
+        ponderer = self.ponderer
+        client = self.engine_client
         try:
-            result = computer_move(self.board, self.max_depth, self.num_workers)
+            # A ponderação usa a mesma tabela e o mesmo pool: precisa parar antes da busca
+            board = Bitboard.from_rows(self.board, self.k)
+            pondered = None
+            if ponderer is not None:
+                ponderer.stop()
+                pondered = ponderer.take(board)
+            if pondered is not None:
+                result = board.coords(pondered[0])
+                logging.info(f"Jogada do computador reaproveitada da ponderação: {result} com score {pondered[1]}")
+            elif client is not None:
+                result = client.computer_move(self.board, self.max_depth, self.time_budget_ms, self.k, self.algorithm)
+                logging.info(f"Jogada do computador recebida do servidor: {result}")
+            else:
+                result = computer_move(self.board, self.max_depth, self.num_workers,
+                                       self.transposition_table, self.tt_bytes, self.time_budget_ms,
+                                       self.engine_pool, self.move_orderer, SearchStats(), cancel, self.k,
+                                       self.algorithm)
             
             # Agenda a aplicação do resultado na interface principal
-            self.window.after(0, lambda: self.apply_computer_move(result))
+            self.window.after(0, lambda: self.apply_computer_move(result, game_id))
             
         except Exception as e:
+            if game_id != self.game_id:
+                return  # A partida foi reiniciada durante a busca
             logging.error(f"Erro na thread do computador: {e}")
             self.window.after(0, lambda: self.handle_computer_error(str(e)))
         
-    def apply_computer_move(self, result):
+    def apply_computer_move(self, result, game_id):
         """Aplica a jogada do computador na interface."""
+        if game_id != self.game_id:
+            return  # Resultado de uma partida que já foi reiniciada
         try:
             if self.thinking and result:
                 row, col = result
@@ -333,6 +297,7 @@ class JogoDaVelha:
                     
                 self.current_player = "X"
                 logging.info("Jogada do computador aplicada")
+                self.start_pondering()
             else:
                 self.thinking = False
                 self.thinking_label.config(text="")
@@ -352,7 +317,7 @@ class JogoDaVelha:
         
     def check_win(self, player):
         """Verifica se o jogador venceu."""
-        return check_win_state(self.board, player)
+        return check_win_state(self.board, player, self.k)
     
     def get_empty_cells(self):
         """Retorna a lista de células vazias."""
@@ -363,8 +328,30 @@ class JogoDaVelha:
                     empty_cells.append((row, col))
         return empty_cells
         
+    def shutdown_engine(self):
+        """Cancela a busca e a ponderação em andamento e encerra o pool de busca da partida."""
+        self.game_id += 1
+        if self.search_cancel is not None:
+            self.search_cancel.set()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+            self.ponderer = None
+        if self.engine_pool is not None:
+            self.engine_pool.close()
+            self.engine_pool = None
+        if self.engine_client is not None:
+            # Fechar a conexão interrompe a espera da thread do computador
+            self.engine_client.close()
+            self.engine_client = None
+        
+    def on_close(self):
+        """Fecha a janela encerrando os workers."""
+        self.shutdown_engine()
+        self.window.destroy()
+        
     def reset_game(self):
         """Reinicia o jogo, voltando à tela de seleção."""
+        self.shutdown_engine()
         self.frame.destroy()
         if hasattr(self, 'thinking_label') and self.thinking_label.winfo_exists():
             self.thinking_label.destroy()
@@ -376,9 +363,7 @@ class JogoDaVelha:
         self.frame.pack(pady=20)
         
         tk.Label(self.frame, text="Escolha o tamanho:", font=("Arial", 14)).pack(pady=10)
-        tk.Button(self.frame, text="3x3", command=lambda: self.show_config(3)).pack(side=tk.LEFT, padx=10)
-        tk.Button(self.frame, text="4x4", command=lambda: self.show_config(4)).pack(side=tk.LEFT, padx=10)
-        tk.Button(self.frame, text="5x5", command=lambda: self.show_config(5)).pack(side=tk.LEFT, padx=10)
+        self.add_variant_buttons()
         
     def run(self):
         """Executa o loop principal do Tkinter."""
@@ -387,14 +372,17 @@ class JogoDaVelha:
             self.window.mainloop()
         except KeyboardInterrupt:
             logging.info("Programa encerrado pelo usuário")
-            self.window.destroy()
+            self.on_close()
         except Exception as e:
             logging.error(f"Erro no loop principal: {e}")
-            self.window.destroy()
+            self.on_close()
 
 if __name__ == '__main__':
     if multiprocessing.get_start_method(allow_none=True) != 'spawn':
         multiprocessing.set_start_method('spawn')  # Necessário para Windows
+    parser = argparse.ArgumentParser(description="Play tic-tac-toe against the engine.")
+    parser.add_argument("--server", help="use an engine.server at HOST:PORT or a Unix socket path")
+    args = parser.parse_args()
     logging.info(f"Número de núcleos disponíveis: {multiprocessing.cpu_count()}")
-    game = JogoDaVelha()
+    game = JogoDaVelha(args.server)
     game.run()